@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse
 from typing import Dict, Any
 from ....services.artifact_service import ArtifactService, get_artifact_service
 
@@ -31,20 +31,15 @@ async def download_artifact(
     if not artifact:
         raise HTTPException(status_code=404, detail="Artifact not found")
 
-    content = artifact_service.get_artifact_content(artifact_id)
-    if content is None:
+    file_path = artifact_service.get_artifact_content_path(artifact_id)
+    if file_path is None:
         raise HTTPException(status_code=404, detail="Artifact content not found")
 
-    def iter_content():
-        yield content
-
-    return StreamingResponse(
-        iter_content(),
+    # Streamed from disk in chunks; sets Content-Length and Content-Disposition
+    return FileResponse(
+        file_path,
         media_type=artifact["content_type"],
-        headers={
-            "Content-Disposition": f"attachment; filename={artifact['name']}",
-            "Content-Length": str(len(content))
-        }
+        filename=artifact["name"]
     )
 
 @router.get("/runs/{run_id}/artifacts")
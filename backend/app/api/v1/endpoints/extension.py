@@ -132,7 +132,7 @@ async def save_to_obsidian_if_configured(data: Dict[str, Any]):
         obsidian_service = ObsidianService()
         if obsidian_service.vault_path:
             # Save chat capture to Obsidian
-            await obsidian_service.save_chat_capture({
+            await obsidian_service.save_chat_capture_async({
                 "title": f"Chat Capture from {data.get('site', 'Unknown')}",
                 "content": format_chat_messages(data.get("messages", [])),
                 "status": "captured"
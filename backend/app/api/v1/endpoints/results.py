@@ -14,7 +14,7 @@ async def save_research_report(
     Manually save a research report to Obsidian.
     """
     try:
-        filepath = obsidian_service.save_research_report(data)
+        filepath = await obsidian_service.save_research_report_async(data)
         return {"message": "Research report saved to Obsidian", "filepath": filepath}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save research report: {str(e)}")
@@ -28,7 +28,7 @@ async def save_youtube_analysis(
     Manually save YouTube analysis to Obsidian.
     """
     try:
-        filepath = obsidian_service.save_youtube_analysis(data)
+        filepath = await obsidian_service.save_youtube_analysis_async(data)
         return {"message": "YouTube analysis saved to Obsidian", "filepath": filepath}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save YouTube analysis: {str(e)}")
@@ -42,7 +42,7 @@ async def save_chat_capture(
     Manually save chat capture to Obsidian.
     """
     try:
-        filepath = obsidian_service.save_chat_capture(data)
+        filepath = await obsidian_service.save_chat_capture_async(data)
         return {"message": "Chat capture saved to Obsidian", "filepath": filepath}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save chat capture: {str(e)}")
@@ -1,12 +1,16 @@
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query, Body
-from typing import Dict, Any, Optional, List
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query, Body, Request, Response
+from typing import Awaitable, Callable, Dict, Any, Iterator, Optional, List
 from datetime import datetime
 from ....services.workflow_service import WorkflowService, get_workflow_service
 from ....services.workflow_persistence_service import get_workflow_persistence_service
+from ....services.query_optimizer import OptimizationLevel
 from ....models.workflow import Workflow, Run, Result
 from ..schemas.workflow import (
     WorkflowExecutionRequest,
     WorkflowExecutionResponse,
+    WorkflowBatchRequest,
+    WorkflowBatchItemResponse,
+    WorkflowBatchResponse,
     WorkflowStatusResponse,
     WorkflowResultResponse,
     WorkflowValidationRequest,
@@ -14,22 +18,110 @@ from ..schemas.workflow import (
     WorkflowOptimizationRequest,
     WorkflowOptimizationResponse,
     WorkflowStatsResponse,
+    WorkflowStorageStatsResponse,
     ExecutionCancelRequest,
     ExecutionCancelResponse
 )
+from fastapi.responses import StreamingResponse
 from sse_starlette.sse import EventSourceResponse
 import asyncio
+import functools
 import logging
+import re
 import subprocess
-import json
-import os
+import time
 import uuid
+from collections import Counter
 from pathlib import Path
 
+import aiofiles
+import aiofiles.os
+import orjson
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Request optimization_level strings mapped to optimizer levels
+_OPT_LEVELS = {
+    "standard": OptimizationLevel.STANDARD,
+    "aggressive": OptimizationLevel.AGGRESSIVE,
+    "basic": OptimizationLevel.BASIC,
+}
+
+# Upper bound on YouTube workflows processed at once; further requests wait
+# for a free slot instead of each spawning a subprocess and Gemini call
+YOUTUBE_WORKFLOW_CONCURRENCY = 4
+_youtube_workflow_slots = asyncio.Semaphore(YOUTUBE_WORKFLOW_CONCURRENCY)
+
+# Attempts for each external step of a YouTube workflow (transcript subprocess,
+# Gemini call); the delay between attempts doubles from the base delay
+YOUTUBE_STEP_ATTEMPTS = 3
+YOUTUBE_RETRY_DELAY_SECONDS = 1.0
+
+def _workflow_etag(workflow_id: str, version: int, updated_at: str) -> str:
+    """Build the weak ETag identifying a stored workflow version."""
+    return f'W/"{workflow_id}:{version}:{updated_at}"'
+
+def _opaque_tag(tag: str) -> str:
+    """Strip the weak indicator from an entity tag, for weak comparison."""
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header covers the given ETag (weak comparison)."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {_opaque_tag(tag) for tag in if_none_match.split(",")}
+    return "*" in candidates or _opaque_tag(etag) in candidates
+
+@functools.lru_cache(maxsize=1)
+def _heartbeat_event(second: int) -> Dict[str, Any]:
+    """SSE heartbeat for a given epoch second, shared by all streams in that second."""
+    return {"event": "heartbeat", "data": {"timestamp": datetime.fromtimestamp(second).isoformat()}}
+
+# Transcript text is encoded and sent in slices of this many characters
+TRANSCRIPT_STREAM_CHUNK_CHARS = 64 * 1024
+
+def _iter_transcript_response(
+    video_id: str,
+    transcript: str,
+    word_count: int,
+    analysis: Optional[Dict[str, Any]],
+    files: Dict[str, Optional[str]]
+) -> Iterator[bytes]:
+    """Encode the transcript response as JSON incrementally, slicing the transcript string."""
+    yield b'{"success":true,"video_id":' + orjson.dumps(video_id) + b',"transcript":"'
+    for start in range(0, len(transcript), TRANSCRIPT_STREAM_CHUNK_CHARS):
+        # Encode each slice as a JSON string and drop its surrounding quotes
+        yield orjson.dumps(transcript[start:start + TRANSCRIPT_STREAM_CHUNK_CHARS])[1:-1]
+    yield (
+        b'","word_count":' + orjson.dumps(word_count)
+        + b',"analysis":' + orjson.dumps(analysis)
+        + b',"files":' + orjson.dumps(files)
+        + b'}'
+    )
+
+_YOUTUBE_ID_RE = re.compile(r'(?:youtube\.com\/watch\?v=|youtu\.be\/)([a-zA-Z0-9_-]{11})')
+# A sentence is any run between terminators that contains non-whitespace
+_SENTENCE_RE = re.compile(r'[^.!?]*[^.!?\s][^.!?]*')
+_JSON_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*(.*?)\s*```\s*$', re.DOTALL)
+
+def _parse_analysis_response(analysis_response: Any) -> Optional[Dict[str, Any]]:
+    """Decode a JSON analysis object from Gemini, tolerating ```json fences. Returns None if it is not one."""
+    if not isinstance(analysis_response, (str, bytes)):
+        return None
+    if isinstance(analysis_response, str):
+        fenced = _JSON_FENCE_RE.match(analysis_response)
+        if fenced:
+            analysis_response = fenced.group(1)
+    try:
+        analysis = orjson.loads(analysis_response)
+    except orjson.JSONDecodeError:
+        return None
+    return analysis if isinstance(analysis, dict) else None
+
 @router.post("/workflows", response_model=Workflow)
 def create_workflow(
     workflow: Workflow,
@@ -93,17 +185,38 @@ def get_workflow_stats(
     stats = workflow_service.get_workflow_stats()
     return WorkflowStatsResponse(**stats)
 
+@router.get("/workflows/storage-stats", response_model=WorkflowStorageStatsResponse)
+def get_workflows_stats(
+    persistence_service = Depends(get_workflow_persistence_service)
+) -> WorkflowStorageStatsResponse:
+    """
+    Get workflow storage statistics.
+    """
+    return WorkflowStorageStatsResponse(**persistence_service.get_storage_stats())
+
 @router.get("/workflows/{workflow_id}", response_model=Workflow)
 def get_workflow_by_id(
     workflow_id: str,
+    request: Request,
+    response: Response,
     persistence_service = Depends(get_workflow_persistence_service)
 ):
     """
     Retrieves a single research workflow by its ID.
+    Returns 304 Not Modified when If-None-Match matches the current version.
     """
+    revision = persistence_service.get_workflow_revision(workflow_id)
+    if revision is None:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+
+    etag = _workflow_etag(workflow_id, *revision)
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
     workflow = persistence_service.load_workflow(workflow_id)
     if not workflow:
         raise HTTPException(status_code=404, detail="Workflow not found")
+    response.headers["ETag"] = etag
     return workflow
 
 @router.put("/workflows/{workflow_id}", response_model=Workflow)
@@ -178,14 +291,26 @@ def get_workflow_versions(
 @router.get("/workflows/{workflow_id}/export")
 def export_workflow(
     workflow_id: str,
+    request: Request,
+    response: Response,
     persistence_service = Depends(get_workflow_persistence_service)
 ):
     """
     Exports a workflow as JSON.
+    Returns 304 Not Modified when If-None-Match matches the current version.
     """
+    revision = persistence_service.get_workflow_revision(workflow_id)
+    if revision is None:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+
+    etag = _workflow_etag(workflow_id, *revision)
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
     json_data = persistence_service.export_workflow(workflow_id)
     if not json_data:
         raise HTTPException(status_code=404, detail="Workflow not found")
+    response.headers["ETag"] = etag
 
     return {
         "workflow_id": workflow_id,
@@ -238,19 +363,12 @@ async def execute_workflow(
     - Returns comprehensive execution summary
     """
     try:
-        logger.info(f"Received workflow execution request for workflow: {request.workflow.get('id', 'unknown')}")
-
-        # Convert request workflow dict to Workflow model
-        workflow = Workflow(**request.workflow)
+        # The request body is validated into a Workflow model by FastAPI
+        workflow = request.workflow
+        logger.info(f"Received workflow execution request for workflow: {workflow.id or 'unknown'}")
 
         # Map optimization level string to enum
-        from ....services.query_optimizer import OptimizationLevel
-        optimization_level_map = {
-            "standard": OptimizationLevel.STANDARD,
-            "aggressive": OptimizationLevel.AGGRESSIVE,
-            "basic": OptimizationLevel.BASIC,
-        }
-        optimization_level = optimization_level_map.get(request.optimization_level, OptimizationLevel.STANDARD)
+        optimization_level = _OPT_LEVELS.get(request.optimization_level, OptimizationLevel.STANDARD)
 
         # Execute workflow with enhanced options
         run_id, execution_summary = await workflow_service.execute_workflow(
@@ -278,6 +396,49 @@ async def execute_workflow(
         logger.error(f"Workflow execution failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Workflow execution failed: {str(e)}")
 
+@router.post("/workflows/execute/batch", response_model=WorkflowBatchResponse)
+async def execute_workflow_batch(
+    request: WorkflowBatchRequest,
+    workflow_service: WorkflowService = Depends(get_workflow_service)
+) -> WorkflowBatchResponse:
+    """
+    Execute several workflows in one request.
+
+    Items run concurrently as independent runs; each item reports its own outcome.
+    """
+    outcomes = await workflow_service.execute_batch([
+        {
+            "workflow": item.workflow,
+            "execution_options": item.execution_options,
+            "validate_workflow": item.validate_workflow,
+            "enable_optimization": item.enable_optimization,
+            "optimization_level": _OPT_LEVELS.get(item.optimization_level, OptimizationLevel.STANDARD),
+        }
+        for item in request.items
+    ])
+
+    results = []
+    for item, outcome in zip(request.items, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error(f"Batch workflow execution failed: {str(outcome)}")
+            results.append(WorkflowBatchItemResponse(
+                workflow_id=item.workflow.id or None,
+                status="failed",
+                error=str(outcome)
+            ))
+            continue
+
+        run_id, execution_summary = outcome
+        results.append(WorkflowBatchItemResponse(
+            run_id=run_id,
+            workflow_id=execution_summary.get("workflow_id"),
+            status=execution_summary.get("status", "running"),
+            error=execution_summary.get("error"),
+            execution_summary=execution_summary
+        ))
+
+    return WorkflowBatchResponse(results=results)
+
 @router.get("/runs/{run_id}/stream")
 async def stream_run_updates(
     run_id: str,
@@ -316,7 +477,7 @@ async def stream_run_updates(
                     yield event
                 except asyncio.TimeoutError:
                     # Send heartbeat to keep connection alive
-                    yield {"event": "heartbeat", "data": {"timestamp": datetime.now().isoformat()}}
+                    yield _heartbeat_event(int(time.time()))
                     continue
 
         except Exception as e:
@@ -393,9 +554,7 @@ async def validate_workflow_endpoint(
     Validate a workflow structure and configuration.
     """
     try:
-        # Convert dict to Workflow model for validation
-        workflow = Workflow(**request.workflow)
-        validation_result = await workflow_service.validate_workflow_graph(workflow)
+        validation_result = await workflow_service.validate_workflow_graph(request.workflow)
 
         return WorkflowValidationResponse(
             valid=validation_result.get("valid", False),
@@ -416,17 +575,10 @@ async def optimize_workflow_endpoint(
     Optimize a workflow for better performance.
     """
     try:
-        # Convert dict to Workflow model
-        workflow = Workflow(**request.workflow)
+        workflow = request.workflow
 
         # Map optimization level
-        from ..services.query_optimizer import OptimizationLevel
-        optimization_level_map = {
-            "standard": OptimizationLevel.STANDARD,
-            "aggressive": OptimizationLevel.AGGRESSIVE,
-            "basic": OptimizationLevel.BASIC,
-        }
-        optimization_level = optimization_level_map.get(request.optimization_level, OptimizationLevel.STANDARD)
+        optimization_level = _OPT_LEVELS.get(request.optimization_level, OptimizationLevel.STANDARD)
 
         optimization_result = await workflow_service.optimize_workflow(
             workflow=workflow,
@@ -448,9 +600,10 @@ async def optimize_workflow_endpoint(
         raise HTTPException(status_code=500, detail=f"Optimization error: {str(e)}")
 
 @router.post("/youtube/transcript")
-async def process_youtube_transcript(url: str = Body(..., embed=False)) -> Dict[str, Any]:
+async def process_youtube_transcript(url: str = Body(..., embed=False)) -> StreamingResponse:
     """
     Process YouTube video transcript.
+    The response body is streamed so large transcripts are never encoded in one piece.
     """
     try:
         # Get the project root directory
@@ -488,30 +641,32 @@ async def process_youtube_transcript(url: str = Body(..., embed=False)) -> Dict[
             raise HTTPException(status_code=500, detail="Failed to generate transcript file")
 
         # Read the transcript data
-        with open(transcript_file, 'r', encoding='utf-8') as f:
-            transcript_data = json.load(f)
+        async with aiofiles.open(transcript_file, 'rb') as f:
+            transcript_data = orjson.loads(await f.read())
 
         # Read analysis data if available
         analysis_data = None
-        if analysis_file and os.path.exists(analysis_file):
-            with open(analysis_file, 'r', encoding='utf-8') as f:
-                analysis_data = json.load(f)
-
-        return {
-            "success": True,
-            "video_id": transcript_data["metadata"]["video_id"],
-            "transcript": transcript_data["transcript"],
-            "word_count": transcript_data["metadata"]["word_count"],
-            "analysis": analysis_data,
-            "files": {
-                "transcript": transcript_file,
-                "analysis": analysis_file
-            }
-        }
+        if analysis_file and await aiofiles.os.path.exists(analysis_file):
+            async with aiofiles.open(analysis_file, 'rb') as f:
+                analysis_data = orjson.loads(await f.read())
+
+        return StreamingResponse(
+            _iter_transcript_response(
+                video_id=transcript_data["metadata"]["video_id"],
+                transcript=transcript_data["transcript"],
+                word_count=transcript_data["metadata"]["word_count"],
+                analysis=analysis_data,
+                files={
+                    "transcript": transcript_file,
+                    "analysis": analysis_file
+                }
+            ),
+            media_type="application/json"
+        )
 
     except subprocess.TimeoutExpired:
         raise HTTPException(status_code=408, detail="Transcript processing timed out")
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Failed to parse transcript data: {e}")
         raise HTTPException(status_code=500, detail="Failed to parse transcript data")
     except Exception as e:
@@ -553,7 +708,31 @@ async def process_youtube_transcript_workflow(url: str, background_tasks: Backgr
         raise HTTPException(status_code=500, detail=f"Failed to start workflow: {str(e)}")
 
 async def process_youtube_workflow_background(task_id: str, url: str):
-    """Process YouTube transcript in background following workflow steps"""
+    """Process YouTube transcript in background, bounded by the workflow pool"""
+    async with _youtube_workflow_slots:
+        await _run_youtube_workflow(task_id, url)
+
+
+async def _with_retries(step: str, call: Callable[[], Awaitable[Any]]) -> Any:
+    """Await call(), retrying failures with exponential backoff up to YOUTUBE_STEP_ATTEMPTS times."""
+    for attempt in range(1, YOUTUBE_STEP_ATTEMPTS + 1):
+        try:
+            return await call()
+        except Exception as e:
+            if attempt == YOUTUBE_STEP_ATTEMPTS:
+                raise
+            delay = YOUTUBE_RETRY_DELAY_SECONDS * (2 ** (attempt - 1))
+            logger.warning(f"{step} failed on attempt {attempt}, retrying in {delay}s: {str(e)}")
+            await asyncio.sleep(delay)
+
+
+def _bullets(items) -> str:
+    """Render items as a markdown list; an empty section keeps its blank line."""
+    return "\n".join(f"- {item}" for item in items)
+
+
+async def _run_youtube_workflow(task_id: str, url: str):
+    """Process YouTube transcript following workflow steps"""
     try:
         from ....services.obsidian_service import get_obsidian_service
         from ....providers.gemini_provider import GeminiProvider
@@ -562,16 +741,20 @@ async def process_youtube_workflow_background(task_id: str, url: str):
         project_root = Path(__file__).parent.parent.parent.parent.parent
         script_path = project_root / "scripts" / "youtube_transcript.py"
 
-        result = subprocess.run(
-            ["python3", str(script_path), url, "--no-analysis"],
-            capture_output=True,
-            text=True,
-            cwd=str(project_root),
-            timeout=60
-        )
-
-        if result.returncode != 0:
-            raise Exception(f"Transcript extraction failed: {result.stderr}")
+        async def extract_transcript():
+            result = await asyncio.to_thread(
+                subprocess.run,
+                ["python3", str(script_path), url, "--no-analysis"],
+                capture_output=True,
+                text=True,
+                cwd=str(project_root),
+                timeout=60
+            )
+            if result.returncode != 0:
+                raise Exception(f"Transcript extraction failed: {result.stderr}")
+            return result
+
+        result = await _with_retries("Transcript extraction", extract_transcript)
 
         # Parse transcript file
         output_lines = result.stdout.strip().split('\n')
@@ -584,8 +767,8 @@ async def process_youtube_workflow_background(task_id: str, url: str):
         if not transcript_file:
             raise Exception("Failed to find transcript file")
 
-        with open(transcript_file, 'r', encoding='utf-8') as f:
-            transcript_data = json.load(f)
+        async with aiofiles.open(transcript_file, 'rb') as f:
+            transcript_data = orjson.loads(await f.read())
 
         # Step 2: Process with Gemini
         gemini_provider = GeminiProvider({"enabled": True})
@@ -605,11 +788,12 @@ async def process_youtube_workflow_background(task_id: str, url: str):
         Format as JSON with keys: topics, summary, insights, recommendations, assessment.
         """
 
-        analysis_response = await gemini_provider.generate(analysis_prompt)
+        analysis_response = await _with_retries(
+            "Gemini analysis", lambda: gemini_provider.generate(analysis_prompt)
+        )
 
-        try:
-            analysis = json.loads(analysis_response)
-        except:
+        analysis = _parse_analysis_response(analysis_response)
+        if analysis is None:
             analysis = {
                 "topics": ["Analysis generated"],
                 "summary": analysis_response,
@@ -620,33 +804,37 @@ async def process_youtube_workflow_background(task_id: str, url: str):
 
         # Step 3: Export to Obsidian
         obsidian_service = get_obsidian_service()
-        obsidian_content = f"""# YouTube Video Analysis
-
-**URL:** {url}
-**Video ID:** {transcript_data['metadata']['video_id']}
-**Word Count:** {transcript_data['metadata']['word_count']}
-**Analysis Date:** {datetime.now().isoformat()}
-
-## Transcript
-{transcript_data['transcript']}
-
-## Analysis
-
-### Main Topics
-{chr(10).join(f"- {topic}" for topic in analysis.get('topics', []))}
-
-### Summary
-{analysis.get('summary', 'No summary available')}
-
-### Key Insights
-{chr(10).join(f"- {insight}" for insight in analysis.get('insights', []))}
-
-### Recommendations
-{chr(10).join(f"- {rec}" for rec in analysis.get('recommendations', []))}
-
-### Overall Assessment
-{analysis.get('assessment', 'No assessment available')}
-"""
+        metadata = transcript_data['metadata']
+        parts = [
+            "# YouTube Video Analysis",
+            "",
+            f"**URL:** {url}",
+            f"**Video ID:** {metadata['video_id']}",
+            f"**Word Count:** {metadata['word_count']}",
+            f"**Analysis Date:** {datetime.now().isoformat()}",
+            "",
+            "## Transcript",
+            transcript_data['transcript'],
+            "",
+            "## Analysis",
+            "",
+            "### Main Topics",
+            _bullets(analysis.get('topics', [])),
+            "",
+            "### Summary",
+            str(analysis.get('summary', 'No summary available')),
+            "",
+            "### Key Insights",
+            _bullets(analysis.get('insights', [])),
+            "",
+            "### Recommendations",
+            _bullets(analysis.get('recommendations', [])),
+            "",
+            "### Overall Assessment",
+            str(analysis.get('assessment', 'No assessment available')),
+            "",
+        ]
+        obsidian_content = "\n".join(parts)
 
         export_result = await obsidian_service.export_content(
             content=obsidian_content,
@@ -695,8 +883,7 @@ async def analyze_transcript(request: Dict[str, Any]) -> Dict[str, Any]:
         # Extract video ID for metadata
         video_id = None
         if video_url:
-            import re
-            match = re.search(r'(?:youtube\.com\/watch\?v=|youtu\.be\/)([a-zA-Z0-9_-]{11})', video_url)
+            match = _YOUTUBE_ID_RE.search(video_url)
             if match:
                 video_id = match.group(1)
 
@@ -721,9 +908,8 @@ async def analyze_transcript(request: Dict[str, Any]) -> Dict[str, Any]:
 
         analysis_response = await gemini_provider.generate(analysis_prompt)
 
-        try:
-            analysis = json.loads(analysis_response)
-        except:
+        analysis = _parse_analysis_response(analysis_response)
+        if analysis is None:
             # Fallback if JSON parsing fails
             analysis = {
                 "topics": ["Content analyzed"],
@@ -734,18 +920,12 @@ async def analyze_transcript(request: Dict[str, Any]) -> Dict[str, Any]:
             }
 
         # Calculate basic statistics
-        word_count = len(transcript_text.split())
-        sentences = transcript_text.split('.')
-        total_sentences = len([s for s in sentences if s.strip()])
-
-        # Simple keyword extraction (top 10 most frequent words)
         words = transcript_text.lower().split()
-        word_freq = {}
-        for word in words:
-            if len(word) > 3:  # Skip short words
-                word_freq[word] = word_freq.get(word, 0) + 1
+        word_count = len(words)
+        total_sentences = len(_SENTENCE_RE.findall(transcript_text))
 
-        top_keywords = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:10]
+        # Simple keyword extraction (top 10 most frequent words, skipping short words)
+        top_keywords = Counter(word for word in words if len(word) > 3).most_common(10)
 
         return {
             "success": True,
@@ -1,10 +1,13 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
+from ....models._response import RESPONSE_MODEL_CONFIG
+from ....models.workflow import RunStatus, Workflow
+
 class WorkflowExecutionRequest(BaseModel):
     """Request model for workflow execution"""
-    workflow: Dict[str, Any] = Field(..., description="Workflow configuration with nodes and edges")
+    workflow: Workflow = Field(..., description="Workflow configuration with nodes and edges")
     execution_options: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Optional execution parameters")
     validate_workflow: bool = Field(default=True, description="Whether to validate workflow before execution")
     enable_optimization: bool = Field(default=True, description="Whether to apply query optimization")
@@ -12,18 +15,42 @@ class WorkflowExecutionRequest(BaseModel):
 
 class WorkflowExecutionResponse(BaseModel):
     """Response model for workflow execution"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     run_id: str = Field(..., description="Unique execution run identifier")
     workflow_id: Optional[str] = Field(None, description="Workflow identifier")
     status: str = Field(..., description="Execution status: 'running', 'completed', 'failed'")
     started_at: str = Field(..., description="Execution start timestamp")
     execution_summary: Dict[str, Any] = Field(default_factory=dict, description="Execution summary with metrics")
 
+class WorkflowBatchRequest(BaseModel):
+    """Request model for executing several workflows at once"""
+    items: List[WorkflowExecutionRequest] = Field(..., description="Workflow execution requests")
+
+class WorkflowBatchItemResponse(BaseModel):
+    """Outcome of one workflow in a batch execution"""
+    model_config = RESPONSE_MODEL_CONFIG
+
+    run_id: Optional[str] = Field(None, description="Run identifier, if the run was started")
+    workflow_id: Optional[str] = Field(None, description="Workflow identifier")
+    status: str = Field(..., description="Execution status: 'completed', 'failed'")
+    error: Optional[str] = Field(None, description="Error message if the workflow could not be executed")
+    execution_summary: Dict[str, Any] = Field(default_factory=dict, description="Execution summary with metrics")
+
+class WorkflowBatchResponse(BaseModel):
+    """Response model for batch workflow execution"""
+    model_config = RESPONSE_MODEL_CONFIG
+
+    results: List[WorkflowBatchItemResponse]
+
 class WorkflowStatusResponse(BaseModel):
     """Response model for workflow execution status"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     run_id: str
     workflow_id: Optional[str]
-    status: str
-    started_at: Optional[str]
+    status: RunStatus
+    started_at: str
     completed_at: Optional[str]
     execution_time: Optional[float]
     execution_order: List[str]
@@ -35,6 +62,8 @@ class WorkflowStatusResponse(BaseModel):
 
 class WorkflowResultResponse(BaseModel):
     """Response model for workflow execution results"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str
     run_id: str
     workflow_id: str
@@ -43,10 +72,12 @@ class WorkflowResultResponse(BaseModel):
 
 class WorkflowValidationRequest(BaseModel):
     """Request model for workflow validation"""
-    workflow: Dict[str, Any] = Field(..., description="Workflow to validate")
+    workflow: Workflow = Field(..., description="Workflow to validate")
 
 class WorkflowValidationResponse(BaseModel):
     """Response model for workflow validation"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     valid: bool
     errors: List[str]
     warnings: List[str]
@@ -54,13 +85,15 @@ class WorkflowValidationResponse(BaseModel):
 
 class WorkflowOptimizationRequest(BaseModel):
     """Request model for workflow optimization"""
-    workflow: Dict[str, Any] = Field(..., description="Workflow to optimize")
+    workflow: Workflow = Field(..., description="Workflow to optimize")
     optimization_level: str = Field(default="standard", description="Optimization level")
     schema: Optional[Dict[str, Any]] = Field(None, description="Optional schema for validation")
     business_rules: Optional[List[Dict[str, Any]]] = Field(None, description="Optional business rules")
 
 class WorkflowOptimizationResponse(BaseModel):
     """Response model for workflow optimization"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     success: bool
     optimized_workflow: Optional[Dict[str, Any]]
     optimization_applied: List[str]
@@ -70,6 +103,8 @@ class WorkflowOptimizationResponse(BaseModel):
 
 class WorkflowStatsResponse(BaseModel):
     """Response model for workflow statistics"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     total_runs: int
     completed_runs: int
     failed_runs: int
@@ -78,12 +113,23 @@ class WorkflowStatsResponse(BaseModel):
     average_execution_time: float
     total_results: int
 
+class WorkflowStorageStatsResponse(BaseModel):
+    """Response model for workflow storage statistics"""
+    model_config = RESPONSE_MODEL_CONFIG
+
+    totalWorkflows: int
+    totalSize: int
+    byCategory: Dict[str, int]
+    storagePath: str
+
 class ExecutionCancelRequest(BaseModel):
     """Request model for canceling execution"""
     run_id: str = Field(..., description="Run ID to cancel")
 
 class ExecutionCancelResponse(BaseModel):
     """Response model for execution cancellation"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     success: bool
     run_id: str
     message: str
\ No newline at end of file
@@ -1,15 +1,23 @@
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Dict, Any, List, Optional
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from typing import Dict, Any, List, Optional, TypeVar
+import asyncio
 import logging
-import json
-from datetime import datetime
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
 from sse_starlette.sse import EventSourceResponse
+import msgspec
+import orjson
 
-# Import our services
-from .services.query_engine import get_query_engine
+# Import our services (the query engine is loaded on first use, see _engine)
 from .services.research_service import initialize_research_service, shutdown_research_service
+from .services.playwright_automation import shutdown_playwright_automation
+from .models._fast import QueryGraphFast, query_graph_decoder
+from .models._response import RESPONSE_MODEL_CONFIG
+from .models.workflow import WORKFLOW_ADAPTER
 
 # Import API routers
 from .api.v1.endpoints import dashboard, workflows, results, artifacts, extension, selectors, custom_nodes, settings
@@ -19,6 +27,12 @@ from .api.v1.endpoints import research
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1)
+def _engine():
+    """Query engine, imported on first use to keep it out of worker start-up."""
+    from .services.query_engine import get_query_engine
+    return get_query_engine()
+
 app = FastAPI(
     title="AI Research Automation Platform",
     description="Backend API for the node-based query system and workflow automation",
@@ -45,6 +59,7 @@ async def startup_event():
 async def shutdown_event():
     """Clean up services on shutdown."""
     await shutdown_research_service()
+    await shutdown_playwright_automation()
     logger.info("Application shutdown complete")
 
 # Include API routers
@@ -65,6 +80,8 @@ class QueryGraphRequest(BaseModel):
     context: Optional[Dict[str, Any]] = None
 
 class QueryGraphResponse(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
+
     success: bool
     results: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
@@ -74,10 +91,29 @@ class QueryGraphResponse(BaseModel):
     failed_nodes: Optional[int] = None
 
 class ValidationResponse(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
+
     valid: bool
     errors: List[str]
     warnings: List[str]
 
+ModelT = TypeVar("ModelT")
+
+async def _parse_body(request: Request, adapter: TypeAdapter[ModelT]) -> ModelT:
+    """Validate the raw request body straight from JSON bytes with a cached adapter."""
+    try:
+        return adapter.validate_json(await request.body())
+    except ValidationError as e:
+        # Match FastAPI's own body-validation error shape
+        raise RequestValidationError([{**error, "loc": ("body", *error["loc"])} for error in e.errors()])
+
+async def _parse_query_graph(request: Request) -> QueryGraphFast:
+    """Decode a query graph body with msgspec, skipping the dict tree and pydantic."""
+    try:
+        return query_graph_decoder.decode(await request.body())
+    except msgspec.DecodeError as e:
+        raise RequestValidationError([{"type": "value_error", "loc": ("body",), "msg": str(e), "input": None}])
+
 @app.get("/")
 def read_root():
     return {
@@ -104,16 +140,18 @@ def health_check():
     }
 
 @app.post("/query/validate", response_model=ValidationResponse)
-def validate_query_graph(request: QueryGraphRequest):
+async def validate_query_graph(raw_request: Request):
     """Validate a query graph structure."""
+    request = await _parse_query_graph(raw_request)
     try:
-        query_engine = get_query_engine()
+        query_engine = _engine()
         validation_result = query_engine.validate_query_graph({
             "nodes": request.nodes,
             "edges": request.edges
         })
 
-        return ValidationResponse(
+        # The engine's output is already typed; response_model still checks it on the way out
+        return ValidationResponse.model_construct(
             valid=validation_result["valid"],
             errors=validation_result["errors"],
             warnings=validation_result["warnings"]
@@ -124,35 +162,41 @@ def validate_query_graph(request: QueryGraphRequest):
         raise HTTPException(status_code=500, detail=f"Validation failed: {str(e)}")
 
 @app.post("/query/execute", response_model=QueryGraphResponse)
-async def execute_query_graph(request: QueryGraphRequest):
+async def execute_query_graph(raw_request: Request):
     """Execute a query graph."""
+    request = await _parse_query_graph(raw_request)
     try:
         logger.info(f"Executing query graph with {len(request.nodes)} nodes")
 
-        query_engine = get_query_engine()
+        query_engine = _engine()
         result = await query_engine.execute_query_graph({
             "nodes": request.nodes,
             "edges": request.edges
         }, request.context)
 
-        return QueryGraphResponse(**result)
+        return QueryGraphResponse.model_construct(**result)
 
     except Exception as e:
         logger.error(f"Query execution error: {e}")
         raise HTTPException(status_code=500, detail=f"Query execution failed: {str(e)}")
 
+async def _sse_json_events(events):
+    """Serialize each engine event once with orjson into an SSE data frame."""
+    async for event in events:
+        yield {"data": orjson.dumps(event, default=str).decode()}
+
 @app.get("/query/execute/stream")
 async def execute_query_graph_streaming(request: QueryGraphRequest):
     """Execute a query graph with streaming results."""
     try:
         logger.info(f"Streaming execution of query graph with {len(request.nodes)} nodes")
 
-        query_engine = get_query_engine()
+        query_engine = _engine()
         return EventSourceResponse(
-            query_engine.execute_query_graph_streaming({
+            _sse_json_events(query_engine.execute_query_graph_streaming({
                 "nodes": request.nodes,
                 "edges": request.edges
-            }, request.context),
+            }, request.context)),
             media_type="text/event-stream"
         )
 
@@ -161,6 +205,7 @@ async def execute_query_graph_streaming(request: QueryGraphRequest):
         raise HTTPException(status_code=500, detail=f"Query streaming execution failed: {str(e)}")
 
 @app.get("/query/node-types")
+@lru_cache(maxsize=1)
 def get_query_node_types():
     """Get available query node types."""
     from .services.query_engine import QueryNodeType
@@ -177,14 +222,12 @@ def get_query_node_types():
 
 # Workflow endpoints (existing)
 @app.post("/workflow/execute")
-async def execute_workflow(workflow: Dict[str, Any]):
+async def execute_workflow(raw_request: Request):
     """Execute a workflow."""
+    workflow_obj = await _parse_body(raw_request, WORKFLOW_ADAPTER)
     try:
         from .services.workflow_service import get_workflow_service
-        from .models.workflow import Workflow
 
-        # Convert dict to Workflow model
-        workflow_obj = Workflow(**workflow)
         workflow_service = get_workflow_service()
         run_id = await workflow_service.execute_workflow(workflow_obj)
 
@@ -206,24 +249,60 @@ async def receive_chat_logs(chat_data: Dict[str, Any]):
         "data": chat_data
     }
 
-# WebSocket connections for real-time updates
-active_websocket_connections: List[WebSocket] = []
+# Maximum number of undelivered messages buffered per dashboard client;
+# updates for a client whose buffer is full are dropped
+DASHBOARD_QUEUE_SIZE = 100
+
+# WebSocket connections for real-time updates, each with its outgoing queue
+active_websocket_connections: Dict[WebSocket, asyncio.Queue] = {}
+
+async def _pump_dashboard_messages(websocket: WebSocket, queue: asyncio.Queue):
+    """Send queued messages to a single dashboard client until it fails."""
+    try:
+        while True:
+            message = await queue.get()
+            await websocket.send_text(message)
+    except Exception as e:
+        logger.error(f"Failed to send WebSocket message: {e}")
+        active_websocket_connections.pop(websocket, None)
 
 @app.websocket("/ws/dashboard")
 async def dashboard_websocket(websocket: WebSocket):
     """WebSocket endpoint for dashboard real-time updates."""
     await websocket.accept()
-    active_websocket_connections.append(websocket)
+    queue = asyncio.Queue(maxsize=DASHBOARD_QUEUE_SIZE)
+    active_websocket_connections[websocket] = queue
+    pump = asyncio.create_task(_pump_dashboard_messages(websocket, queue))
 
     try:
         while True:
             # Keep connection alive and listen for client messages
             data = await websocket.receive_text()
+            if pump.done():
+                # The pump stops after a failed send, so nothing would drain the queue
+                break
             # For now, just echo back (could be used for client commands)
-            await websocket.send_text(f"Echo: {data}")
+            try:
+                queue.put_nowait(f"Echo: {data}")
+            except asyncio.QueueFull:
+                logger.warning("Dashboard client is not keeping up; dropping echo")
     except WebSocketDisconnect:
-        if websocket in active_websocket_connections:
-            active_websocket_connections.remove(websocket)
+        pass
+    finally:
+        active_websocket_connections.pop(websocket, None)
+        pump.cancel()
+
+# Last formatted broadcast timestamp, keyed by wall-clock millisecond
+_ts_cache: tuple = (0, "")
+
+def _iso_now() -> str:
+    """UTC ISO timestamp at millisecond resolution, reused within the same millisecond."""
+    global _ts_cache
+    ms = time.time_ns() // 1_000_000
+    if ms != _ts_cache[0]:
+        stamp = datetime.fromtimestamp(ms / 1000, tz=timezone.utc).replace(tzinfo=None)
+        _ts_cache = (ms, stamp.isoformat(timespec='milliseconds') + 'Z')
+    return _ts_cache[1]
 
 # Function to broadcast updates to all connected dashboard clients
 async def broadcast_dashboard_update(update_type: str, data: Dict[str, Any]):
@@ -231,18 +310,13 @@ async def broadcast_dashboard_update(update_type: str, data: Dict[str, Any]):
     message = {
         "type": update_type,
         "data": data,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": _iso_now()
     }
 
-    disconnected_clients = []
-    for websocket in active_websocket_connections:
+    # Serialize once and hand off to each client's pump without awaiting sends
+    payload = orjson.dumps(message).decode()
+    for queue in list(active_websocket_connections.values()):
         try:
-            await websocket.send_text(json.dumps(message))
-        except Exception as e:
-            logger.error(f"Failed to send WebSocket message: {e}")
-            disconnected_clients.append(websocket)
-
-    # Clean up disconnected clients
-    for client in disconnected_clients:
-        if client in active_websocket_connections:
-            active_websocket_connections.remove(client)
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            logger.warning("Dashboard client is not keeping up; dropping update")
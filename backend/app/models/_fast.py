@@ -0,0 +1,21 @@
+"""
+msgspec mirrors of hot request payloads.
+
+These structs decode request bodies directly from JSON bytes without
+building an intermediate dict tree or running pydantic validation. They are
+attribute-compatible with the pydantic models they mirror, so handlers can
+use either interchangeably.
+"""
+from typing import Any, Dict, List, Optional
+
+import msgspec
+
+
+class QueryGraphFast(msgspec.Struct):
+    """Mirror of ``QueryGraphRequest`` in ``app.main``."""
+    nodes: List[Dict[str, Any]]
+    edges: List[Dict[str, Any]]
+    context: Optional[Dict[str, Any]] = None
+
+
+query_graph_decoder = msgspec.json.Decoder(QueryGraphFast)
@@ -0,0 +1,7 @@
+"""
+Shared configuration for API response models.
+"""
+from pydantic import ConfigDict
+
+# Response models are built once per request and serialized straight away
+RESPONSE_MODEL_CONFIG = ConfigDict(frozen=True, extra='forbid')
@@ -6,7 +6,9 @@ Pydantic models for custom node API endpoints.
 
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from ._response import RESPONSE_MODEL_CONFIG
 
 
 class CustomNodeDefinition(BaseModel):
@@ -25,12 +27,16 @@ class CustomNodeDefinition(BaseModel):
 
 class CustomNodeValidationResult(BaseModel):
     """Result of node validation"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     valid: bool = Field(..., description="Whether validation passed")
     errors: List[str] = Field(default_factory=list, description="Validation error messages")
 
 
 class CustomNodeRegistration(BaseModel):
     """Result of node registration"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str = Field(..., description="Registration ID")
     node_type: str = Field(..., description="Registered node type")
     user_id: Optional[str] = Field(None, description="User who registered the node")
@@ -41,6 +47,9 @@ class CustomNodeRegistration(BaseModel):
 
 class CustomNodeMetadata(BaseModel):
     """Node metadata"""
+    # Imported registries may carry extra metadata keys, so unknown fields are ignored
+    model_config = ConfigDict(frozen=True)
+
     registration_id: str = Field(..., description="Registration ID")
     created_at: str = Field(..., description="Creation timestamp")
     updated_at: str = Field(..., description="Last update timestamp")
@@ -52,12 +61,16 @@ class CustomNodeMetadata(BaseModel):
 
 class CustomNodeInfo(BaseModel):
     """Complete node information"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     definition: CustomNodeDefinition = Field(..., description="Node definition")
     metadata: Optional[CustomNodeMetadata] = Field(None, description="Node metadata")
 
 
 class CustomNodeListItem(BaseModel):
     """Node list item"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     type: str = Field(..., description="Node type")
     name: str = Field(..., description="Node name")
     description: str = Field(..., description="Node description")
@@ -67,6 +80,8 @@ class CustomNodeListItem(BaseModel):
 
 class CustomNodeDeployment(BaseModel):
     """Node deployment information"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     deployment_id: str = Field(..., description="Deployment ID")
     node_type: str = Field(..., description="Deployed node type")
     status: str = Field(..., description="Deployment status")
@@ -84,6 +99,8 @@ class CustomNodeLoadRequest(BaseModel):
 
 class CustomNodeLoadResult(BaseModel):
     """Result of loading nodes"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     loaded_types: List[str] = Field(default_factory=list, description="Successfully loaded node types")
     failed_types: List[str] = Field(default_factory=list, description="Failed node types")
     errors: List[str] = Field(default_factory=list, description="Error messages")
@@ -103,6 +120,8 @@ class CustomNodeImportRequest(BaseModel):
 
 class RegistryStats(BaseModel):
     """Registry statistics"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     total_nodes: int = Field(..., description="Total number of nodes")
     active_nodes: int = Field(..., description="Number of active nodes")
     inactive_nodes: int = Field(..., description="Number of inactive nodes")
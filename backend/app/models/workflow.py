@@ -1,6 +1,10 @@
-from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Union, Dict, Any
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
+from typing import List, Literal, Optional, Sequence, Union, Dict, Any, Tuple
+from collections import defaultdict, deque
 from datetime import datetime
+from functools import cached_property, lru_cache
+import hashlib
+import json
 
 class WorkflowMetadata(BaseModel):
     createdAt: Optional[str] = Field(None, format="date-time")
@@ -13,6 +17,12 @@ class WorkflowMetadata(BaseModel):
     version: int = Field(default=1)
     thumbnail: Optional[str] = None
 
+# Identity, display and run-state fields that do not affect a node's output
+_NODE_SIGNATURE_EXCLUDE = {
+    "id", "name", "description", "tags", "created_at", "updated_at",
+    "status", "execution_time", "error_message",
+}
+
 class Node(BaseModel):
     model_config = ConfigDict(extra='allow')  # Allow extra fields for node-specific configurations
 
@@ -33,6 +43,19 @@ class Node(BaseModel):
     execution_time: Optional[float] = Field(None, description="Time taken to execute")
     error_message: Optional[str] = Field(None, description="Last error message")
 
+    def signature(self, inputs: Sequence[Tuple[str, str, str]] = ()) -> str:
+        """Hash of what this node computes: its type, its configuration and its inputs.
+
+        Each input is a (source_port, target_port, parent_signature) triple, so the
+        hash changes when a parent is wired to a different port.
+        """
+        config = self.model_dump(exclude=_NODE_SIGNATURE_EXCLUDE, mode="json")
+        payload = json.dumps(
+            [self.type, config, sorted(map(list, inputs))],
+            sort_keys=True, separators=(",", ":"), default=str
+        ).encode()
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
 class Edge(BaseModel):
     id: str
     source: Optional[str] = None
@@ -43,6 +66,31 @@ class Edge(BaseModel):
     type: Optional[str] = None
     meta: Dict[str, Any] = Field(default_factory=dict)
 
+@lru_cache(maxsize=256)
+def _topological_order(node_ids: Tuple[str, ...], edges: Tuple[Tuple[str, str], ...]) -> Tuple[str, ...]:
+    """Kahn's algorithm over node ids; edges to unknown nodes are ignored."""
+    known = set(node_ids)
+    successors = defaultdict(list)
+    in_degree = dict.fromkeys(node_ids, 0)
+    for source, target in edges:
+        if source in known and target in known:
+            successors[source].append(target)
+            in_degree[target] += 1
+
+    queue = deque(node_id for node_id in node_ids if in_degree[node_id] == 0)
+    order = []
+    while queue:
+        node_id = queue.popleft()
+        order.append(node_id)
+        for successor in successors[node_id]:
+            in_degree[successor] -= 1
+            if in_degree[successor] == 0:
+                queue.append(successor)
+
+    if len(order) != len(node_ids):
+        raise ValueError("Workflow graph contains a cycle")
+    return tuple(order)
+
 class Workflow(BaseModel):
     model_config = ConfigDict(extra='allow')  # Allow execution_data to be set dynamically
 
@@ -61,24 +109,74 @@ class Workflow(BaseModel):
     def edgeCount(self) -> int:
         return len(self.edges)
 
-class WorkflowExecution(BaseModel):
-    id: str
-    workflow_id: str
-    status: str  # "pending", "running", "completed", "failed"
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
-    results: Optional[dict] = None
+    # The cached properties below are computed once per instance; they do not
+    # track later in-place changes to nodes or edges.
+
+    @cached_property
+    def _graph_key(self) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, str], ...]]:
+        node_ids = tuple(sorted(node.id for node in self.nodes))
+        edges = tuple(sorted(
+            (edge.source or edge.from_ or "", edge.target or edge.to or "")
+            for edge in self.edges
+        ))
+        return node_ids, edges
+
+    @cached_property
+    def signature(self) -> str:
+        """Stable hash of the graph structure (node ids and edge endpoints)."""
+        payload = json.dumps(self._graph_key, separators=(",", ":")).encode()
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    @cached_property
+    def topo_order(self) -> List[str]:
+        """Node ids in topological order, shared across workflows with the same structure."""
+        return list(_topological_order(*self._graph_key))
+
+    @cached_property
+    def node_content_signatures(self) -> Dict[str, str]:
+        """Per-node hash of what the node computes, including everything upstream of it."""
+        # Ports decide which input a parent feeds (see legacy_workflow_to_composition)
+        incoming = defaultdict(list)
+        for edge in self.edges:
+            incoming[edge.target or edge.to or ""].append((
+                edge.source or edge.from_ or "",
+                edge.meta.get("source_port") or "",
+                edge.meta.get("target_port") or "",
+            ))
+
+        nodes_by_id = {node.id: node for node in self.nodes}
+        signatures: Dict[str, str] = {}
+        for node_id in self.topo_order:
+            signatures[node_id] = nodes_by_id[node_id].signature([
+                (source_port, target_port, signatures[parent])
+                for parent, source_port, target_port in incoming[node_id]
+                if parent in signatures
+            ])
+        return signatures
+
+    @cached_property
+    def content_signature(self) -> str:
+        """Hash of what the workflow computes, independent of node ids and ordering."""
+        payload = json.dumps(sorted(self.node_content_signatures.values()), separators=(",", ":")).encode()
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+# Shared validators for payloads that arrive as raw JSON or plain dicts
+WORKFLOW_ADAPTER = TypeAdapter(Workflow)
+NODE_LIST_ADAPTER = TypeAdapter(List[Node])
+EDGE_LIST_ADAPTER = TypeAdapter(List[Edge])
+
+RunStatus = Literal["pending", "running", "completed", "failed", "cancelled"]
 
 class Run(BaseModel):
     id: str
     workflow_id: str
-    status: str  # "pending", "running", "completed", "failed"
-    started_at: Optional[datetime] = None
+    status: RunStatus
+    started_at: datetime = Field(default_factory=datetime.now)
     completed_at: Optional[datetime] = None
     execution_time: Optional[float] = None
-    execution_order: List[str] = []
-    node_results: Dict[str, Any] = {}
-    execution_options: Dict[str, Any] = {}
+    execution_order: List[str] = Field(default_factory=list)
+    node_results: Dict[str, Any] = Field(default_factory=dict)
+    execution_options: Dict[str, Any] = Field(default_factory=dict)
     error: Optional[str] = None
 
 class Result(BaseModel):
@@ -86,4 +184,4 @@ class Result(BaseModel):
     run_id: str
     workflow_id: str
     data: Dict[str, Any]
-    created_at: datetime = datetime.now()
\ No newline at end of file
+    created_at: datetime = Field(default_factory=datetime.now)
\ No newline at end of file
@@ -1,13 +1,56 @@
+import heapq
 import os
 import uuid
-from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+from functools import singledispatch
+from typing import IO, Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import json
 import logging
 from pathlib import Path
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# Per-run metadata journal, one JSON object per stored artifact
+JOURNAL_FILENAME = "index.jsonl"
+
+# Journal handles kept open at once; the least recently used is closed beyond this
+MAX_OPEN_JOURNALS = 32
+
+# Run directory handles kept open at once for openat()-style data file creation
+MAX_OPEN_RUN_DIRS = 32
+
+def _dump_json(content: Any) -> bytes:
+    """Serialize JSON artifact content or metadata compactly, straight to bytes."""
+    try:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        # orjson rejects a few values the stdlib accepts, e.g. integers beyond 64 bits
+        return json.dumps(content, separators=(",", ":")).encode("utf-8")
+
+@singledispatch
+def _serialize_content(content: Any, content_type: str) -> Tuple[bytes, str]:
+    """Serialize artifact content to bytes, returning them with the content type to record."""
+    # Convert to string
+    return str(content).encode('utf-8'), content_type
+
+@_serialize_content.register(dict)
+@_serialize_content.register(list)
+def _(content, content_type: str) -> Tuple[bytes, str]:
+    return _dump_json(content), "application/json"
+
+@_serialize_content.register(str)
+def _(content: str, content_type: str) -> Tuple[bytes, str]:
+    if not content_type or content_type == "application/json":
+        content_type = "text/plain"
+    return content.encode('utf-8'), content_type
+
+@_serialize_content.register(bytes)
+def _(content: bytes, content_type: str) -> Tuple[bytes, str]:
+    return content, content_type
+
 class ArtifactService:
     """
     Service for managing workflow execution artifacts (files, data exports, etc.)
@@ -17,6 +60,97 @@ class ArtifactService:
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(exist_ok=True)
         self._artifacts: Dict[str, Dict[str, Any]] = {}
+        # Secondary index: run_id -> artifact_id -> artifact metadata
+        self._by_run: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._run_journals: "OrderedDict[str, IO[bytes]]" = OrderedDict()
+        # (created_ts, artifact_id), oldest first, so cleanup stops at the first live artifact
+        self._expiry_heap: List[Tuple[float, str]] = []
+        # run_id -> open directory fd (None where the platform lacks dir_fd support)
+        self._run_dirfds: "OrderedDict[str, Optional[int]]" = OrderedDict()
+
+    def _journal_for_run(self, run_id: str, run_dir: Path) -> IO[bytes]:
+        """Return the open append handle for a run's journal, opening it on first use."""
+        journal = self._run_journals.get(run_id)
+        if journal is None:
+            journal = open(run_dir / JOURNAL_FILENAME, "ab")
+            self._run_journals[run_id] = journal
+            while len(self._run_journals) > MAX_OPEN_JOURNALS:
+                _, oldest = self._run_journals.popitem(last=False)
+                oldest.close()
+        else:
+            self._run_journals.move_to_end(run_id)
+        return journal
+
+    def _run_dirfd(self, run_id: str, run_dir: Path) -> Optional[int]:
+        """Return an open fd for a run's directory, creating the directory on first use."""
+        if run_id in self._run_dirfds:
+            self._run_dirfds.move_to_end(run_id)
+            return self._run_dirfds[run_id]
+
+        os.makedirs(run_dir, exist_ok=True)
+        dir_fd = None
+        if os.open in os.supports_dir_fd and hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(run_dir, os.O_RDONLY | os.O_DIRECTORY)
+        self._run_dirfds[run_id] = dir_fd
+        while len(self._run_dirfds) > MAX_OPEN_RUN_DIRS:
+            _, oldest = self._run_dirfds.popitem(last=False)
+            if oldest is not None:
+                os.close(oldest)
+        return dir_fd
+
+    def _close_run_dirfd(self, run_id: str):
+        dir_fd = self._run_dirfds.pop(run_id, None)
+        if dir_fd is not None:
+            os.close(dir_fd)
+
+    def _write_data_file(self, run_id: str, run_dir: Path, filename: str, data: bytes):
+        """Create a run's data file relative to the cached directory fd."""
+        for attempt in range(2):
+            dir_fd = self._run_dirfd(run_id, run_dir)
+            if dir_fd is None:
+                (run_dir / filename).write_bytes(data)
+                return
+            try:
+                fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644, dir_fd=dir_fd)
+            except FileNotFoundError:
+                # The run directory was removed underneath the cached fd; reopen it once
+                self._close_run_dirfd(run_id)
+                if attempt:
+                    raise
+                continue
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            return
+
+    def _close_journal(self, run_id: str):
+        journal = self._run_journals.pop(run_id, None)
+        if journal is not None:
+            journal.close()
+
+    def _read_journal(self, run_id: str) -> List[Dict[str, Any]]:
+        """Read the artifact metadata recorded in a run's journal."""
+        journal_path = self.storage_path / run_id / JOURNAL_FILENAME
+        if not journal_path.exists():
+            return []
+
+        artifacts = []
+        with open(journal_path, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    artifacts.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    logger.warning(f"Skipping corrupt journal entry for run {run_id}")
+        return artifacts
+
+    def close(self):
+        """Close any open run journals and directory handles."""
+        for run_id in list(self._run_journals):
+            self._close_journal(run_id)
+        for run_id in list(self._run_dirfds):
+            self._close_run_dirfd(run_id)
 
     def store_artifact(
         self,
@@ -41,53 +175,37 @@ class ArtifactService:
         """
         artifact_id = str(uuid.uuid4())
 
-        # Create run directory
         run_dir = self.storage_path / run_id
-        run_dir.mkdir(exist_ok=True)
 
         # Prepare artifact data
+        created = datetime.now()
         artifact_data = {
             "id": artifact_id,
             "run_id": run_id,
             "name": artifact_name,
             "content_type": content_type,
-            "created_at": datetime.now().isoformat(),
+            "created_at": created.isoformat(),
+            # Epoch seconds, so cleanup compares without parsing created_at
+            "created_ts": created.timestamp(),
             "size": 0,
             "metadata": metadata or {}
         }
 
-        # Store content based on type
-        file_path = run_dir / f"{artifact_id}.data"
-
-        if isinstance(content, (dict, list)):
-            # JSON content
-            json_content = json.dumps(content, indent=2)
-            file_path.write_text(json_content)
-            artifact_data["size"] = len(json_content.encode('utf-8'))
-            artifact_data["content_type"] = "application/json"
-        elif isinstance(content, str):
-            # Text content
-            file_path.write_text(content)
-            artifact_data["size"] = len(content.encode('utf-8'))
-            if not content_type or content_type == "application/json":
-                artifact_data["content_type"] = "text/plain"
-        else:
-            # Binary or other content
-            if isinstance(content, bytes):
-                file_path.write_bytes(content)
-                artifact_data["size"] = len(content)
-            else:
-                # Convert to string
-                str_content = str(content)
-                file_path.write_text(str_content)
-                artifact_data["size"] = len(str_content.encode('utf-8'))
+        # Serialize content based on type
+        data, artifact_data["content_type"] = _serialize_content(content, content_type)
+
+        self._write_data_file(run_id, run_dir, f"{artifact_id}.data", data)
+        artifact_data["size"] = len(data)
 
         # Store artifact metadata
         self._artifacts[artifact_id] = artifact_data
+        self._by_run.setdefault(run_id, {})[artifact_id] = artifact_data
+        heapq.heappush(self._expiry_heap, (artifact_data["created_ts"], artifact_id))
 
-        # Save metadata to file
-        metadata_file = run_dir / f"{artifact_id}.meta.json"
-        metadata_file.write_text(json.dumps(artifact_data, indent=2))
+        # Append metadata to the run's journal
+        journal = self._journal_for_run(run_id, run_dir)
+        journal.write(_dump_json(artifact_data) + b"\n")
+        journal.flush()
 
         logger.info(f"Stored artifact {artifact_id} for run {run_id}: {artifact_name}")
         return artifact_id
@@ -114,27 +232,48 @@ class ArtifactService:
         Returns:
             List of artifact metadata
         """
-        return [artifact for artifact in self._artifacts.values() if artifact["run_id"] == run_id]
+        artifacts = list(self._by_run.get(run_id, {}).values())
+        if artifacts:
+            return artifacts
+
+        # Fall back to the on-disk journal for runs stored by another service instance
+        return self._read_journal(run_id)
 
     def get_artifact_content(self, artifact_id: str) -> Optional[bytes]:
         """
         Get the raw content of an artifact.
 
+        This reads the whole file into memory; to serve an artifact, stream
+        the file at get_artifact_content_path() instead.
+
         Args:
             artifact_id: The artifact ID
 
         Returns:
             The artifact content as bytes, or None if not found
         """
+        file_path = self.get_artifact_content_path(artifact_id)
+        if file_path is None:
+            return None
+        return file_path.read_bytes()
+
+    def get_artifact_content_path(self, artifact_id: str) -> Optional[Path]:
+        """
+        Get the path of the file holding an artifact's content.
+
+        Args:
+            artifact_id: The artifact ID
+
+        Returns:
+            The content file path, or None if not found
+        """
         artifact = self.get_artifact(artifact_id)
         if not artifact:
             return None
 
-        run_dir = self.storage_path / artifact["run_id"]
-        file_path = run_dir / f"{artifact_id}.data"
-
+        file_path = self.storage_path / artifact["run_id"] / f"{artifact_id}.data"
         if file_path.exists():
-            return file_path.read_bytes()
+            return file_path
         return None
 
     def get_artifact_download_url(self, artifact_id: str) -> Optional[str]:
@@ -193,31 +332,116 @@ class ArtifactService:
         Returns:
             Number of artifacts cleaned up
         """
-        cutoff_date = datetime.now().timestamp() - (days_old * 24 * 60 * 60)
-        cleaned_count = 0
+        expired = self._expire_artifacts(days_old)
+        self._unlink_expired(expired)
+        return sum(len(artifact_ids) for _, artifact_ids in expired)
+
+    def _expire_artifacts(self, days_old: int) -> List[Tuple[Path, List[str]]]:
+        """
+        Drop expired artifacts from memory and their run journals.
 
-        for artifact_id, artifact in list(self._artifacts.items()):
-            created_timestamp = datetime.fromisoformat(artifact["created_at"]).timestamp()
-            if created_timestamp < cutoff_date:
-                # Remove files
-                run_dir = self.storage_path / artifact["run_id"]
-                data_file = run_dir / f"{artifact_id}.data"
-                meta_file = run_dir / f"{artifact_id}.meta.json"
+        Returns:
+            (run directory, expired artifact ids) per affected run
+        """
+        cutoff_date = datetime.now().timestamp() - (days_old * 24 * 60 * 60)
 
-                try:
-                    if data_file.exists():
-                        data_file.unlink()
-                    if meta_file.exists():
-                        meta_file.unlink()
-                except Exception as e:
-                    logger.warning(f"Failed to remove artifact files for {artifact_id}: {e}")
-
-                # Remove from memory
+        # Collect every victim first, grouped by run
+        victims_by_run: Dict[str, List[str]] = {}
+        while self._expiry_heap and self._expiry_heap[0][0] < cutoff_date:
+            _, artifact_id = heapq.heappop(self._expiry_heap)
+            artifact = self._artifacts.get(artifact_id)
+            if artifact is None:
+                # Already removed
+                continue
+            victims_by_run.setdefault(artifact["run_id"], []).append(artifact_id)
+
+        expired = []
+        for run_id, artifact_ids in victims_by_run.items():
+            run_artifacts = self._by_run.get(run_id, {})
+            for artifact_id in artifact_ids:
                 del self._artifacts[artifact_id]
-                cleaned_count += 1
+                run_artifacts.pop(artifact_id, None)
+            if not run_artifacts:
+                self._by_run.pop(run_id, None)
+                self._close_run_dirfd(run_id)
+            self._rewrite_journal(run_id, artifact_ids)
+            expired.append((self.storage_path / run_id, artifact_ids))
 
+        return expired
+
+    def _unlink_expired(self, expired: List[Tuple[Path, List[str]]]):
+        """Unlink the files of expired artifacts, one directory handle per run."""
+        cleaned_count = 0
+        for run_dir, artifact_ids in expired:
+            # .meta.json sidecars predate the run journal
+            filenames = [
+                filename
+                for artifact_id in artifact_ids
+                for filename in (f"{artifact_id}.data", f"{artifact_id}.meta.json")
+            ]
+            self._unlink_batch(run_dir, filenames)
+            cleaned_count += len(artifact_ids)
         logger.info(f"Cleaned up {cleaned_count} old artifacts")
-        return cleaned_count
+
+    @staticmethod
+    def _unlink_batch(run_dir: Path, filenames: List[str]):
+        """Unlink files relative to one open directory handle, ignoring ones already gone."""
+        dir_fd = None
+        if os.unlink in os.supports_dir_fd:
+            try:
+                dir_fd = os.open(run_dir, os.O_RDONLY)
+            except OSError:
+                dir_fd = None
+
+        try:
+            for filename in filenames:
+                try:
+                    if dir_fd is not None:
+                        os.unlink(filename, dir_fd=dir_fd)
+                    else:
+                        os.unlink(run_dir / filename)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.warning(f"Failed to remove artifact file {run_dir / filename}: {e}")
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
+
+    def _rewrite_journal(self, run_id: str, removed_ids: List[str]):
+        """Rewrite a run's journal without the entries of removed artifacts."""
+        self._close_journal(run_id)
+        journal_path = self.storage_path / run_id / JOURNAL_FILENAME
+        removed = set(removed_ids)
+
+        try:
+            if not journal_path.exists():
+                return
+
+            # Filter the journal on disk rather than regenerating it from memory,
+            # which only holds the artifacts this instance stored or loaded
+            remaining = []
+            with open(journal_path, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        entry = None
+                    artifact_id = entry.get("id") if isinstance(entry, dict) else None
+                    if artifact_id not in removed:
+                        remaining.append(line if line.endswith(b"\n") else line + b"\n")
+
+            if not remaining:
+                journal_path.unlink()
+                return
+            tmp_path = journal_path.with_suffix(".jsonl.tmp")
+            with open(tmp_path, "wb") as f:
+                f.writelines(remaining)
+            os.replace(tmp_path, journal_path)
+        except Exception as e:
+            logger.warning(f"Failed to rewrite artifact journal for run {run_id}: {e}")
 
 # Dependency injection provider
 def get_artifact_service() -> ArtifactService:
@@ -9,6 +9,7 @@ import asyncio
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import json
+import logging
 from pathlib import Path
 
 from ..models.custom_node import (
@@ -21,6 +22,8 @@ from nodes.node_registry import node_registry
 from nodes.node_validator import node_validator
 from nodes.node_loader import node_loader
 
+logger = logging.getLogger(__name__)
+
 
 class CustomNodeService:
     """Service for managing custom nodes"""
@@ -96,8 +99,8 @@ class CustomNodeService:
 
             return success
 
-        except Exception as e:
-            print(f"Error updating node {node_type}: {e}")
+        except Exception:
+            logger.exception("Error updating node %s", node_type)
             return False
 
     async def delete_node(self, node_type: str, user_id: Optional[str] = None) -> bool:
@@ -113,8 +116,8 @@ class CustomNodeService:
 
             return success
 
-        except Exception as e:
-            print(f"Error deleting node {node_type}: {e}")
+        except Exception:
+            logger.exception("Error deleting node %s", node_type)
             return False
 
     async def get_node(self, node_type: str) -> Optional[Dict[str, Any]]:
@@ -184,12 +187,13 @@ class CustomNodeService:
                 raise ValueError(f"Node type '{node_type}' not found")
 
             # Mark as deployed
-            deployment_id = f"deploy_{node_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            deployed_at = datetime.now()
+            deployment_id = f"deploy_{node_type}_{deployed_at.strftime('%Y%m%d_%H%M%S')}"
 
             self._active_deployments[deployment_id] = {
                 "node_type": node_type,
                 "config": deployment_config,
-                "deployed_at": datetime.now(),
+                "deployed_at": deployed_at,
                 "status": "active"
             }
 
@@ -222,8 +226,8 @@ class CustomNodeService:
 
             return True
 
-        except Exception as e:
-            print(f"Error undeploying node {node_type}: {e}")
+        except Exception:
+            logger.exception("Error undeploying node %s", node_type)
             return False
 
     async def load_nodes_from_file(self, file_path: str, user_id: Optional[str] = None) -> List[str]:
@@ -232,18 +236,13 @@ class CustomNodeService:
             loaded_types = await node_loader.load_from_file(file_path, register=True)
 
             # Update metadata with user_id
-            for node_type in loaded_types:
-                if user_id:
-                    metadata = node_registry.get_node_metadata(node_type)
-                    if metadata:
-                        metadata["user_id"] = user_id
-                        # Save updated metadata
-                        node_registry._save_registry()
+            if user_id:
+                node_registry.bulk_update_metadata(loaded_types, {"user_id": user_id})
 
             return loaded_types
 
-        except Exception as e:
-            print(f"Error loading nodes from file {file_path}: {e}")
+        except Exception:
+            logger.exception("Error loading nodes from file %s", file_path)
             return []
 
     async def load_nodes_from_directory(self, directory_path: str, user_id: Optional[str] = None) -> List[str]:
@@ -252,17 +251,13 @@ class CustomNodeService:
             loaded_types = await node_loader.load_from_directory(directory_path, register=True)
 
             # Update metadata with user_id
-            for node_type in loaded_types:
-                if user_id:
-                    metadata = node_registry.get_node_metadata(node_type)
-                    if metadata:
-                        metadata["user_id"] = user_id
-                        node_registry._save_registry()
+            if user_id:
+                node_registry.bulk_update_metadata(loaded_types, {"user_id": user_id})
 
             return loaded_types
 
-        except Exception as e:
-            print(f"Error loading nodes from directory {directory_path}: {e}")
+        except Exception:
+            logger.exception("Error loading nodes from directory %s", directory_path)
             return []
 
     async def export_nodes(self, node_types: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -275,17 +270,13 @@ class CustomNodeService:
             imported_types = node_registry.import_nodes(data, user_id)
 
             # Update metadata with user_id for newly imported nodes
-            for node_type in imported_types:
-                if user_id:
-                    metadata = node_registry.get_node_metadata(node_type)
-                    if metadata:
-                        metadata["user_id"] = user_id
-                        node_registry._save_registry()
+            if user_id:
+                node_registry.bulk_update_metadata(imported_types, {"user_id": user_id})
 
             return imported_types
 
-        except Exception as e:
-            print(f"Error importing nodes: {e}")
+        except Exception:
+            logger.exception("Error importing nodes")
             return []
 
     def get_registry_stats(self) -> Dict[str, Any]:
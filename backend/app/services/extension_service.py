@@ -5,42 +5,74 @@ Handles data flow from Chrome extension to workflow dataSource nodes.
 """
 
 import asyncio
+import heapq
 import json
+import logging
+from collections import Counter, OrderedDict
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import IO, Dict, Any, List, Optional
 from pathlib import Path
 import os
 
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+# Compact the event log once it holds this many events per live record
+COMPACTION_RATIO = 4
+
+
+def _dump_event(event: Dict[str, Any]) -> bytes:
+    """Serialize one event log line."""
+    try:
+        return orjson.dumps(event) + b"\n"
+    except TypeError:
+        # orjson rejects a few values the stdlib accepts, e.g. integers beyond 64 bits
+        return json.dumps(event, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _capture_timestamp(capture: Dict[str, Any]) -> str:
+    return capture.get("timestamp", "")
+
 
 class ExtensionDataStore:
-    """In-memory store for extension-captured data"""
+    """In-memory store for extension-captured data, persisted as an append-only event log"""
 
     def __init__(self):
-        self.data_store: Dict[str, Dict[str, Any]] = {}
+        # Per-user captures in arrival order, oldest first
+        self.data_store: Dict[str, "OrderedDict[str, Dict[str, Any]]"] = {}
         self.max_entries_per_user = 100
-        self.data_file = Path("extension_data.json")
+        self.data_file = Path("extension_data.jsonl")
+        # Monolithic snapshot written by earlier versions, migrated on first load
+        self.legacy_data_file = Path("extension_data.json")
+        self._event_count = 0
+        # Per-user running counters: processed count and captures per site
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        # Per-user unprocessed capture ids, as an insertion-ordered set
+        self._unprocessed: Dict[str, Dict[str, None]] = {}
+        # Append handle for the event log, opened on first write
+        self._log: Optional[IO[bytes]] = None
 
     def save_chat_capture(self, data: Dict[str, Any]) -> str:
         """Save chat capture data from extension"""
         user_id = data.get("userId", "anonymous")
-        capture_id = f"chat_{user_id}_{int(datetime.now().timestamp())}"
-
-        # Ensure user directory exists
-        if user_id not in self.data_store:
-            self.data_store[user_id] = {}
+        now = datetime.now()
+        capture_id = f"chat_{user_id}_{int(now.timestamp())}"
 
         # Limit entries per user
-        user_data = self.data_store[user_id]
+        user_data = self.data_store.get(user_id, {})
         if len(user_data) >= self.max_entries_per_user:
             # Remove oldest entry
-            oldest_key = min(user_data.keys(), key=lambda k: user_data[k].get("timestamp", ""))
-            del user_data[oldest_key]
+            oldest_key = next(iter(user_data))
+            self._delete_record(user_id, oldest_key)
+            self._append_event({"op": "delete", "user": user_id, "id": oldest_key})
 
         # Store the data
-        user_data[capture_id] = {
+        record = {
             "id": capture_id,
             "type": "chat_capture",
-            "timestamp": data.get("timestamp", datetime.now().isoformat()),
+            "timestamp": data["timestamp"] if "timestamp" in data else now.isoformat(),
             "site": data.get("site", "unknown"),
             "model": data.get("model", "unknown"),
             "messages": data.get("messages", []),
@@ -51,8 +83,10 @@ class ExtensionDataStore:
             }
         }
 
+        self._put_record(user_id, capture_id, record)
+
         # Persist to disk
-        self._persist_data()
+        self._append_event({"op": "put", "user": user_id, "id": capture_id, "record": record})
 
         return capture_id
 
@@ -63,44 +97,152 @@ class ExtensionDataStore:
     def get_recent_captures(self, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent captures for a user"""
         user_data = self.get_user_data(user_id)
-        captures = list(user_data.values())
 
-        # Sort by timestamp (newest first)
-        captures.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-
-        return captures[:limit]
+        # Newest first by timestamp, without sorting captures past the limit
+        return heapq.nlargest(limit, user_data.values(), key=_capture_timestamp)
 
     def mark_as_processed(self, capture_id: str, user_id: str):
         """Mark a capture as processed by workflow"""
         if user_id in self.data_store and capture_id in self.data_store[user_id]:
-            self.data_store[user_id][capture_id]["metadata"]["processed"] = True
-            self.data_store[user_id][capture_id]["metadata"]["processed_at"] = datetime.now().isoformat()
-            self._persist_data()
+            processed_at = datetime.now().isoformat()
+            self._apply_processed(user_id, capture_id, processed_at)
+            self._append_event({"op": "processed", "user": user_id, "id": capture_id, "at": processed_at})
 
     def get_unprocessed_data(self, user_id: str) -> List[Dict[str, Any]]:
         """Get unprocessed captures for workflow consumption"""
         user_data = self.get_user_data(user_id)
-        return [
-            capture for capture in user_data.values()
-            if not capture.get("metadata", {}).get("processed", False)
-        ]
+        return [user_data[capture_id] for capture_id in self._unprocessed.get(user_id, {})]
 
-    def _persist_data(self):
-        """Persist data to disk"""
+    def get_stats(self, user_id: str) -> Dict[str, Any]:
+        """Get running capture counts for a user"""
+        stats = self._stats.get(user_id)
+        return {
+            "total": len(self.data_store.get(user_id, {})),
+            "processed": stats["processed"] if stats else 0,
+            "sites": dict(stats["sites"]) if stats else {}
+        }
+
+    def _user_stats(self, user_id: str) -> Dict[str, Any]:
+        return self._stats.setdefault(user_id, {"processed": 0, "sites": Counter()})
+
+    @staticmethod
+    def _is_processed(record: Dict[str, Any]) -> bool:
+        return record.get("metadata", {}).get("processed", False)
+
+    def _put_record(self, user_id: str, capture_id: str, record: Dict[str, Any]):
+        """Insert a capture as the user's newest, replacing any capture with the same id"""
+        user_data = self.data_store.setdefault(user_id, OrderedDict())
+        if capture_id in user_data:
+            self._delete_record(user_id, capture_id)
+        user_data[capture_id] = record
+
+        stats = self._user_stats(user_id)
+        stats["sites"][record.get("site", "unknown")] += 1
+        if self._is_processed(record):
+            stats["processed"] += 1
+        else:
+            self._unprocessed.setdefault(user_id, {})[capture_id] = None
+
+    def _delete_record(self, user_id: str, capture_id: str):
+        record = self.data_store.get(user_id, {}).pop(capture_id, None)
+        if record is None:
+            return
+
+        stats = self._user_stats(user_id)
+        site = record.get("site", "unknown")
+        stats["sites"][site] -= 1
+        if stats["sites"][site] <= 0:
+            del stats["sites"][site]
+        if self._is_processed(record):
+            stats["processed"] -= 1
+        else:
+            self._unprocessed.get(user_id, {}).pop(capture_id, None)
+
+    def _apply_processed(self, user_id: str, capture_id: str, processed_at: str):
+        record = self.data_store[user_id][capture_id]
+        if not self._is_processed(record):
+            self._user_stats(user_id)["processed"] += 1
+            self._unprocessed.get(user_id, {}).pop(capture_id, None)
+        metadata = record["metadata"]
+        metadata["processed"] = True
+        metadata["processed_at"] = processed_at
+
+    def _apply_event(self, event: Dict[str, Any]):
+        """Apply one logged mutation to the in-memory store"""
+        op, user_id, capture_id = event.get("op"), event.get("user"), event.get("id")
+        if op == "put":
+            self._put_record(user_id, capture_id, event["record"])
+        elif op == "processed":
+            if capture_id in self.data_store.get(user_id, {}):
+                self._apply_processed(user_id, capture_id, event["at"])
+        elif op == "delete":
+            self._delete_record(user_id, capture_id)
+
+    def _live_record_count(self) -> int:
+        return sum(len(user_data) for user_data in self.data_store.values())
+
+    def close(self):
+        """Close the event log append handle"""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def _append_event(self, event: Dict[str, Any]):
+        """Append a mutation to the event log, compacting it when it grows stale"""
         try:
-            with open(self.data_file, 'w') as f:
-                json.dump(self.data_store, f, indent=2)
-        except Exception as e:
-            print(f"Failed to persist extension data: {e}")
+            if self._log is None:
+                self._log = open(self.data_file, 'ab')
+            self._log.write(_dump_event(event))
+            self._log.flush()
+            self._event_count += 1
+        except Exception:
+            logger.exception("Failed to persist extension data")
+            self.close()
+            return
+
+        if self._event_count > COMPACTION_RATIO * max(self._live_record_count(), 1):
+            self.compact()
+
+    def compact(self):
+        """Rewrite the event log as one put event per live record"""
+        tmp_file = self.data_file.with_suffix(".jsonl.tmp")
+        try:
+            with open(tmp_file, 'wb') as f:
+                for user_id, user_data in self.data_store.items():
+                    for capture_id, record in user_data.items():
+                        event = {"op": "put", "user": user_id, "id": capture_id, "record": record}
+                        f.write(_dump_event(event))
+            # The handle would keep appending to the replaced file
+            self.close()
+            os.replace(tmp_file, self.data_file)
+            self._event_count = self._live_record_count()
+        except Exception:
+            logger.exception("Failed to compact extension data")
 
     def _load_data(self):
-        """Load data from disk"""
+        """Load data from disk by replaying the event log"""
         try:
             if self.data_file.exists():
-                with open(self.data_file, 'r') as f:
-                    self.data_store = json.load(f)
-        except Exception as e:
-            print(f"Failed to load extension data: {e}")
+                with open(self.data_file, 'rb') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            event = orjson.loads(line)
+                        except orjson.JSONDecodeError:
+                            # A write interrupted mid-line only loses that one event
+                            logger.warning("Skipping corrupt extension data event")
+                            continue
+                        self._apply_event(event)
+                        self._event_count += 1
+            elif self.legacy_data_file.exists():
+                raw = orjson.loads(self.legacy_data_file.read_bytes())
+                for user_id, user_data in raw.items():
+                    for capture_id, record in sorted(user_data.items(), key=lambda kv: _capture_timestamp(kv[1])):
+                        self._put_record(user_id, capture_id, record)
+                self.compact()
+        except Exception:
+            logger.exception("Failed to load extension data")
 
 
 class ExtensionService:
@@ -165,27 +307,14 @@ class ExtensionService:
 
     def get_user_stats(self, user_id: str) -> Dict[str, Any]:
         """Get statistics for a user's extension data"""
-        user_data = self.data_store.get_user_data(user_id)
-
-        total_captures = len(user_data)
-        processed_captures = sum(
-            1 for capture in user_data.values()
-            if capture.get("metadata", {}).get("processed", False)
-        )
-        unprocessed_captures = total_captures - processed_captures
-
-        # Get site breakdown
-        site_counts = {}
-        for capture in user_data.values():
-            site = capture.get("site", "unknown")
-            site_counts[site] = site_counts.get(site, 0) + 1
+        stats = self.data_store.get_stats(user_id)
 
         return {
             "user_id": user_id,
-            "total_captures": total_captures,
-            "processed_captures": processed_captures,
-            "unprocessed_captures": unprocessed_captures,
-            "site_breakdown": site_counts
+            "total_captures": stats["total"],
+            "processed_captures": stats["processed"],
+            "unprocessed_captures": stats["total"] - stats["processed"],
+            "site_breakdown": stats["sites"]
         }
 
 
@@ -1,9 +1,75 @@
+import asyncio
+import json
 import os
+import re
 import yaml
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 
+import aiofiles
+
+# Frontmatter only holds plain scalars and lists, so the safe dumper suffices;
+# prefer the libyaml-backed one when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as _FrontmatterDumper
+except ImportError:
+    from yaml import SafeDumper as _FrontmatterDumper
+
+# Strings that can be written as plain YAML scalars without quoting or being read back
+# as another type: a leading letter, then only characters with no YAML meaning here
+_PLAIN_SCALAR_RE = re.compile(r'[A-Za-z][A-Za-z0-9 _.,()/-]*(?<! )')
+# Plain words YAML 1.1 resolves to booleans or null
+_YAML_RESERVED_WORDS = frozenset({'y', 'n', 'yes', 'no', 'on', 'off', 'true', 'false', 'null'})
+# Characters JSON leaves unescaped that YAML reads as line breaks or rejects as non-printable
+_YAML_UNSAFE_CHARS_RE = re.compile('[\x7f-\x9f\u2028\u2029\ud800-\udfff\ufeff\ufffe\uffff]')
+
+def _yaml_scalar(value: str) -> str:
+    """Render a string as a YAML scalar, quoting it unless it is plainly safe."""
+    if _PLAIN_SCALAR_RE.fullmatch(value) and value.lower() not in _YAML_RESERVED_WORDS:
+        return value
+    # A JSON string is a valid YAML double-quoted scalar once the characters YAML
+    # treats as line breaks or non-printable are escaped too
+    quoted = json.dumps(value, ensure_ascii=False)
+    return _YAML_UNSAFE_CHARS_RE.sub(lambda match: f"\\u{ord(match.group()):04x}", quoted)
+
+def _emit_frontmatter(frontmatter: Dict[str, Any]) -> str:
+    """
+    Render note frontmatter as YAML.
+
+    Notes only use string fields and lists of strings, which are written
+    directly; anything else goes through the YAML emitter.
+    """
+    lines = []
+    for key, value in frontmatter.items():
+        if not isinstance(key, str) or not _PLAIN_SCALAR_RE.fullmatch(key):
+            break
+        if isinstance(value, str):
+            lines.append(f"{key}: {_yaml_scalar(value)}\n")
+        elif isinstance(value, list) and value and all(isinstance(item, str) for item in value):
+            lines.append(f"{key}:\n")
+            lines.extend(f"- {_yaml_scalar(item)}\n" for item in value)
+        else:
+            break
+    else:
+        return "".join(lines)
+
+    return yaml.dump(
+        frontmatter,
+        Dumper=_FrontmatterDumper,
+        default_flow_style=False,
+        allow_unicode=True,
+        sort_keys=False
+    )
+
+# Anything but letters, digits, spaces, hyphens and underscores (Unicode-aware, like str.isalnum)
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r'[^\w\- ]')
+
+# Vault path -> {subdirectory name -> directory known to exist}, with "" for the vault itself.
+# Kept per process because the service is constructed per request. Only positive
+# results are remembered, so a vault created later is still picked up
+_NOTE_DIRS: Dict[str, Dict[str, Path]] = {}
+
 class ObsidianService:
     """
     Service for saving research reports and chat captures to Obsidian vault as Markdown files with YAML frontmatter.
@@ -19,6 +85,8 @@ class ObsidianService:
         self.vault_path = vault_path or os.getenv("OBSIDIAN_VAULT_PATH")
         if not self.vault_path:
             raise ValueError("Obsidian vault path must be provided or set via OBSIDIAN_VAULT_PATH environment variable")
+        # Directories known to exist in this vault, shared with other instances using it
+        self._note_dirs = _NOTE_DIRS.setdefault(self.vault_path, {})
 
     def set_vault_path(self, path: str):
         """
@@ -28,6 +96,7 @@ class ObsidianService:
             path: Path to the Obsidian vault directory.
         """
         self.vault_path = path
+        self._note_dirs = _NOTE_DIRS.setdefault(self.vault_path, {})
 
     def save_research_report(self, data: Dict[str, Any]) -> str:
         """
@@ -40,36 +109,49 @@ class ObsidianService:
             Path to the saved file.
         """
         try:
-            # Create frontmatter
-            frontmatter = {
-                "title": data.get("query", "Research Report"),
-                "date": datetime.now().isoformat(),
-                "tags": ["research", "deep-research"],
-                "type": "research_report",
-                "workflow_type": "deep_research"
-            }
-
-            # Create content
-            content = f"# {data.get('query', 'Research Report')}\n\n"
-            content += f"**Mode:** {data.get('mode', 'comprehensive')}\n\n"
-            content += f"**Status:** {data.get('status', 'unknown')}\n\n"
-
-            if "result" in data:
-                content += "## Results\n\n"
-                content += str(data["result"])
-            elif "error" in data:
-                content += "## Error\n\n"
-                content += data["error"]
-
-            # Save to Research subdirectory
-            filename = self._generate_filename(data.get("query", "Research Report"), "research")
-            filepath = self._save_to_vault(filename, frontmatter, content, "Research")
-
-            return filepath
+            filename, frontmatter, content, subdirectory = self._build_research_report(data)
+            return self._save_to_vault(filename, frontmatter, content, subdirectory)
 
         except Exception as e:
             raise Exception(f"Failed to save research report: {str(e)}")
 
+    def _build_research_report(self, data: Dict[str, Any]) -> Tuple[str, Dict[str, Any], str, str]:
+        """
+        Build the note for a deep research report.
+
+        Returns:
+            Tuple of (filename, frontmatter, content, subdirectory).
+        """
+        # One clock reading for both the frontmatter date and the filename
+        now = datetime.now()
+
+        # Create frontmatter
+        frontmatter = {
+            "title": data.get("query", "Research Report"),
+            "date": now.isoformat(),
+            "tags": ["research", "deep-research"],
+            "type": "research_report",
+            "workflow_type": "deep_research"
+        }
+
+        # Create content
+        if "result" in data:
+            section = f"## Results\n\n{data['result']}"
+        elif "error" in data:
+            section = f"## Error\n\n{data['error']}"
+        else:
+            section = ""
+        content = (
+            f"# {data.get('query', 'Research Report')}\n\n"
+            f"**Mode:** {data.get('mode', 'comprehensive')}\n\n"
+            f"**Status:** {data.get('status', 'unknown')}\n\n"
+            f"{section}"
+        )
+
+        # Save to Research subdirectory
+        filename = self._generate_filename(data.get("query", "Research Report"), "research", now)
+        return filename, frontmatter, content, "Research"
+
     def save_youtube_analysis(self, data: Dict[str, Any]) -> str:
         """
         Save YouTube transcript analysis to Obsidian.
@@ -81,37 +163,50 @@ class ObsidianService:
             Path to the saved file.
         """
         try:
-            # Create frontmatter
-            frontmatter = {
-                "title": f"YouTube Analysis: {data.get('url', 'Unknown URL')}",
-                "date": datetime.now().isoformat(),
-                "tags": ["youtube", "transcript", "analysis"],
-                "type": "youtube_analysis",
-                "workflow_type": "youtube_transcript",
-                "url": data.get("url", "")
-            }
-
-            # Create content
-            content = f"# YouTube Transcript Analysis\n\n"
-            content += f"**URL:** {data.get('url', 'N/A')}\n\n"
-            content += f"**Status:** {data.get('status', 'unknown')}\n\n"
-
-            if "result" in data:
-                content += "## Analysis Results\n\n"
-                content += str(data["result"])
-            elif "error" in data:
-                content += "## Error\n\n"
-                content += data["error"]
-
-            # Save to Transcripts subdirectory
-            filename = self._generate_filename(f"YouTube_{data.get('url', 'Unknown')}", "youtube")
-            filepath = self._save_to_vault(filename, frontmatter, content, "Transcripts")
-
-            return filepath
+            filename, frontmatter, content, subdirectory = self._build_youtube_analysis(data)
+            return self._save_to_vault(filename, frontmatter, content, subdirectory)
 
         except Exception as e:
             raise Exception(f"Failed to save YouTube analysis: {str(e)}")
 
+    def _build_youtube_analysis(self, data: Dict[str, Any]) -> Tuple[str, Dict[str, Any], str, str]:
+        """
+        Build the note for a YouTube transcript analysis.
+
+        Returns:
+            Tuple of (filename, frontmatter, content, subdirectory).
+        """
+        # One clock reading for both the frontmatter date and the filename
+        now = datetime.now()
+
+        # Create frontmatter
+        frontmatter = {
+            "title": f"YouTube Analysis: {data.get('url', 'Unknown URL')}",
+            "date": now.isoformat(),
+            "tags": ["youtube", "transcript", "analysis"],
+            "type": "youtube_analysis",
+            "workflow_type": "youtube_transcript",
+            "url": data.get("url", "")
+        }
+
+        # Create content
+        if "result" in data:
+            section = f"## Analysis Results\n\n{data['result']}"
+        elif "error" in data:
+            section = f"## Error\n\n{data['error']}"
+        else:
+            section = ""
+        content = (
+            "# YouTube Transcript Analysis\n\n"
+            f"**URL:** {data.get('url', 'N/A')}\n\n"
+            f"**Status:** {data.get('status', 'unknown')}\n\n"
+            f"{section}"
+        )
+
+        # Save to Transcripts subdirectory
+        filename = self._generate_filename(f"YouTube_{data.get('url', 'Unknown')}", "youtube", now)
+        return filename, frontmatter, content, "Transcripts"
+
     def save_chat_capture(self, data: Dict[str, Any]) -> str:
         """
         Save chat capture to Obsidian.
@@ -123,35 +218,96 @@ class ObsidianService:
             Path to the saved file.
         """
         try:
-            # Create frontmatter
-            frontmatter = {
-                "title": data.get("title", "Chat Capture"),
-                "date": datetime.now().isoformat(),
-                "tags": ["chat", "capture"],
-                "type": "chat_capture",
-                "workflow_type": "chat_export"
-            }
-
-            # Create content
-            content = f"# {data.get('title', 'Chat Capture')}\n\n"
-            content += f"**Status:** {data.get('status', 'unknown')}\n\n"
-
-            if "content" in data:
-                content += "## Chat Content\n\n"
-                content += data["content"]
-            elif "error" in data:
-                content += "## Error\n\n"
-                content += data["error"]
-
-            # Save to Chats subdirectory
-            filename = self._generate_filename(data.get("title", "Chat Capture"), "chat")
-            filepath = self._save_to_vault(filename, frontmatter, content, "Chats")
-
-            return filepath
+            filename, frontmatter, content, subdirectory = self._build_chat_capture(data)
+            return self._save_to_vault(filename, frontmatter, content, subdirectory)
 
         except Exception as e:
             raise Exception(f"Failed to save chat capture: {str(e)}")
 
+    def _build_chat_capture(self, data: Dict[str, Any]) -> Tuple[str, Dict[str, Any], str, str]:
+        """
+        Build the note for a chat capture.
+
+        Returns:
+            Tuple of (filename, frontmatter, content, subdirectory).
+        """
+        # One clock reading for both the frontmatter date and the filename
+        now = datetime.now()
+
+        # Create frontmatter
+        frontmatter = {
+            "title": data.get("title", "Chat Capture"),
+            "date": now.isoformat(),
+            "tags": ["chat", "capture"],
+            "type": "chat_capture",
+            "workflow_type": "chat_export"
+        }
+
+        # Create content
+        if "content" in data:
+            section = f"## Chat Content\n\n{data['content']}"
+        elif "error" in data:
+            section = f"## Error\n\n{data['error']}"
+        else:
+            section = ""
+        content = (
+            f"# {data.get('title', 'Chat Capture')}\n\n"
+            f"**Status:** {data.get('status', 'unknown')}\n\n"
+            f"{section}"
+        )
+
+        # Save to Chats subdirectory
+        filename = self._generate_filename(data.get("title", "Chat Capture"), "chat", now)
+        return filename, frontmatter, content, "Chats"
+
+    async def save_research_report_async(self, data: Dict[str, Any]) -> str:
+        """
+        Save a deep research report to Obsidian without blocking the event loop.
+
+        Args:
+            data: Dictionary containing research data with keys like query, result, etc.
+
+        Returns:
+            Path to the saved file.
+        """
+        return await asyncio.to_thread(self.save_research_report, data)
+
+    async def save_youtube_analysis_async(self, data: Dict[str, Any]) -> str:
+        """
+        Save YouTube transcript analysis to Obsidian without blocking the event loop.
+
+        Args:
+            data: Dictionary containing YouTube analysis data.
+
+        Returns:
+            Path to the saved file.
+        """
+        return await asyncio.to_thread(self.save_youtube_analysis, data)
+
+    async def save_chat_capture_async(self, data: Dict[str, Any]) -> str:
+        """
+        Save chat capture to Obsidian without blocking the event loop.
+
+        Args:
+            data: Dictionary containing chat data.
+
+        Returns:
+            Path to the saved file.
+        """
+        return await asyncio.to_thread(self.save_chat_capture, data)
+
+    # Workflow task type -> note saver and note builder; add more types as needed
+    _RESULT_SAVERS = {
+        "deep_research": save_research_report,
+        "youtube_transcript": save_youtube_analysis,
+        "chat_export": save_chat_capture,
+    }
+    _RESULT_BUILDERS = {
+        "deep_research": _build_research_report,
+        "youtube_transcript": _build_youtube_analysis,
+        "chat_export": _build_chat_capture,
+    }
+
     def save_workflow_results(self, workflow_id: str, results: Dict[str, Any]) -> Dict[str, str]:
         """
         Save all workflow results to Obsidian.
@@ -167,19 +323,44 @@ class ObsidianService:
 
         try:
             for task_id, task_result in results.items():
-                if task_result.get("task_type") == "deep_research":
-                    filepath = self.save_research_report(task_result)
-                    saved_files[task_id] = filepath
-                elif task_result.get("task_type") == "youtube_transcript":
-                    filepath = self.save_youtube_analysis(task_result)
-                    saved_files[task_id] = filepath
-                # Add more types as needed
+                save = self._RESULT_SAVERS.get(task_result.get("task_type"))
+                if save is not None:
+                    saved_files[task_id] = save(self, task_result)
 
             return saved_files
 
         except Exception as e:
             raise Exception(f"Failed to save workflow results: {str(e)}")
 
+    async def save_workflow_results_async(self, workflow_id: str, results: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Save all workflow results to Obsidian, writing the notes concurrently.
+
+        Args:
+            workflow_id: ID of the workflow.
+            results: Dictionary of task results.
+
+        Returns:
+            Dictionary mapping task IDs to saved file paths.
+        """
+        try:
+            task_ids = []
+            writes = []
+            for task_id, task_result in results.items():
+                build = self._RESULT_BUILDERS.get(task_result.get("task_type"))
+                if build is None:
+                    continue
+                filename, frontmatter, content, subdirectory = build(self, task_result)
+                filepath = self._resolve_note_path(filename, subdirectory)
+                task_ids.append(task_id)
+                payload = self._render_note(frontmatter, content).encode('utf-8')
+                writes.append(self._save_to_vault_async(filepath, payload))
+
+            return dict(zip(task_ids, await asyncio.gather(*writes)))
+
+        except Exception as e:
+            raise Exception(f"Failed to save workflow results: {str(e)}")
+
     def _save_to_vault(self, filename: str, frontmatter: Dict[str, Any], content: str, subdirectory: str = "") -> str:
         """
         Save content to Obsidian vault.
@@ -193,33 +374,74 @@ class ObsidianService:
         Returns:
             Full path to the saved file.
         """
+        filepath = self._resolve_note_path(filename, subdirectory)
+        payload = self._render_note(frontmatter, content).encode('utf-8')
+
+        # Write to file: the note is encoded up front, so skip the text-mode wrapper
+        filepath.write_bytes(payload)
+
+        return str(filepath)
+
+    async def _save_to_vault_async(self, filepath: Path, payload: bytes) -> str:
+        """
+        Write a rendered note to the vault without blocking the event loop.
+
+        Args:
+            filepath: Path returned by _resolve_note_path.
+            payload: UTF-8 encoded note text returned by _render_note.
+
+        Returns:
+            Full path to the saved file.
+        """
+        async with aiofiles.open(filepath, 'wb') as f:
+            await f.write(payload)
+
+        return str(filepath)
+
+    def _resolve_note_path(self, filename: str, subdirectory: str = "") -> Path:
+        """
+        Resolve the path a note is saved to, creating its subdirectory if needed.
+
+        Args:
+            filename: Name of the file (without extension).
+            subdirectory: Subdirectory within vault to save to.
+
+        Returns:
+            Full path of the note file.
+        """
         if not self.vault_path:
             raise Exception("Obsidian vault path not configured")
 
         # Ensure vault directory exists
-        vault_path = Path(self.vault_path)
-        if not vault_path.exists():
-            raise Exception(f"Obsidian vault directory does not exist: {self.vault_path}")
+        vault_path = self._note_dirs.get("")
+        if vault_path is None:
+            vault_path = Path(self.vault_path)
+            if not vault_path.is_dir():
+                raise Exception(f"Obsidian vault directory does not exist: {self.vault_path}")
+            self._note_dirs[""] = vault_path
 
         # Create subdirectory if specified
-        if subdirectory:
+        target_dir = self._note_dirs.get(subdirectory)
+        if target_dir is None:
             target_dir = vault_path / subdirectory
             self._ensure_directory(target_dir)
-        else:
-            target_dir = vault_path
+            self._note_dirs[subdirectory] = target_dir
 
         # Create full file path
-        filepath = target_dir / f"{filename}.md"
+        return target_dir / f"{filename}.md"
 
-        # Create Markdown content with frontmatter
-        yaml_frontmatter = yaml.dump(frontmatter, default_flow_style=False, allow_unicode=True)
-        full_content = f"---\n{yaml_frontmatter}---\n\n{content}"
+    def _render_note(self, frontmatter: Dict[str, Any], content: str) -> str:
+        """
+        Render Markdown content with YAML frontmatter.
 
-        # Write to file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(full_content)
+        Args:
+            frontmatter: YAML frontmatter dictionary.
+            content: Markdown content.
 
-        return str(filepath)
+        Returns:
+            The full note text.
+        """
+        return f"---\n{_emit_frontmatter(frontmatter)}---\n\n{content}"
 
     def _ensure_directory(self, path: Path):
         """
@@ -230,23 +452,24 @@ class ObsidianService:
         """
         path.mkdir(parents=True, exist_ok=True)
 
-    def _generate_filename(self, title: str, content_type: str) -> str:
+    def _generate_filename(self, title: str, content_type: str, now: Optional[datetime] = None) -> str:
         """
         Generate a safe filename from title and content type.
 
         Args:
             title: Base title for the file.
             content_type: Type of content (research, youtube, chat).
+            now: Time to stamp the filename with. Defaults to the current time.
 
         Returns:
             Safe filename string.
         """
         # Sanitize title
-        safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        safe_title = _UNSAFE_FILENAME_CHARS_RE.sub('', title).rstrip()
         safe_title = safe_title.replace(' ', '_')
 
         # Add timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = (now or datetime.now()).strftime("%Y%m%d_%H%M%S")
 
         return f"{content_type}_{safe_title}_{timestamp}"
 
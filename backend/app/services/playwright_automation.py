@@ -1,51 +1,156 @@
-from playwright.async_api import async_playwright, Browser, Page, TimeoutError
-from typing import Optional, Dict, Any
+from playwright.async_api import async_playwright, Browser, BrowserContext, ElementHandle, Page, Route, TimeoutError
+from typing import Optional, Dict, Any, List, Tuple
+from collections import Counter
 import asyncio
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# Transcript timestamp patterns like [0:00] or 0:00
+_TS_RE = re.compile(r'\[\d+:\d+(?::\d+)?\]|\d+:\d+(?::\d+)?')
+# A timestamp followed by its text, up to the next timestamp or the end
+_TS_EXTRACT_RE = re.compile(
+    r'(?:\[)?(\d+):(\d+)(?::(\d+))?(?:\])?\s*(.*?)(?=(?:\[\d+:\d+(?::\d+)?\]|$|\d+:\d+(?::\d+)?))',
+    re.DOTALL
+)
+_WORD_RE = re.compile(r'\b\w+\b')
+# A run of text between periods that is not just whitespace
+_SENTENCE_RE = re.compile(r'[^.]*[^.\s][^.]*')
+
+# Common stop words skipped by topic extraction
+_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
+    'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did',
+    'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these',
+    'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'
+})
+
+# Instructions appended to a research query for the known modes
+_MODE_INSTRUCTIONS = {
+    "comprehensive": "\n\nPlease provide a comprehensive analysis with multiple sources and detailed explanations.",
+    "focused": "\n\nPlease provide a focused analysis with key findings and main sources.",
+}
+
+# Resource types the automated pages never need; media stays allowed for YouTube playback
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font"})
+
+async def _block_unneeded_resources(route: Route):
+    """
+    Route handler that aborts requests for blocked resource types.
+    """
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
 class PlaywrightAutomation:
     """
     A class to handle browser automation using Playwright for the Deep Research workflow.
     """
 
+    # One Playwright driver and Chromium process shared by every instance;
+    # each instance gets its own browser context and page
+    _playwright = None
+    _shared_browser: Optional[Browser] = None
+    _browser_lock = asyncio.Lock()
+
     def __init__(self):
         self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         self.is_authenticated = False
 
+    @classmethod
+    async def _ensure_browser(cls) -> Browser:
+        """
+        Returns the shared browser, starting Playwright and Chromium on first use.
+        """
+        async with cls._browser_lock:
+            if cls._shared_browser is None or not cls._shared_browser.is_connected():
+                if cls._playwright is None:
+                    cls._playwright = await async_playwright().start()
+                cls._shared_browser = await cls._playwright.chromium.launch(
+                    headless=False,
+                    args=[
+                        '--no-sandbox',
+                        '--disable-setuid-sandbox',
+                        '--disable-dev-shm-usage',
+                        '--disable-accelerated-2d-canvas',
+                        '--no-first-run',
+                        '--no-zygote',
+                        '--disable-gpu'
+                    ]
+                )
+            return cls._shared_browser
+
+    @classmethod
+    async def shutdown(cls):
+        """
+        Closes the shared browser and stops the Playwright driver.
+        """
+        async with cls._browser_lock:
+            if cls._shared_browser is not None:
+                await cls._shared_browser.close()
+                cls._shared_browser = None
+            if cls._playwright is not None:
+                await cls._playwright.stop()
+                cls._playwright = None
+
     async def launch_browser(self):
         """
-        Launches a Playwright-controlled browser instance with appropriate settings.
-        """
-        playwright = await async_playwright().start()
-        self.browser = await playwright.chromium.launch(
-            headless=False,
-            args=[
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-accelerated-2d-canvas',
-                '--no-first-run',
-                '--no-zygote',
-                '--disable-gpu'
-            ]
-        )
-        self.page = await self.browser.new_page()
+        Opens a fresh browser context and page on the shared browser instance.
+        """
+        self.browser = await self._ensure_browser()
+        self.context = await self.browser.new_context()
+        await self.context.route("**/*", _block_unneeded_resources)
+        self.page = await self.context.new_page()
 
         # Set up page event listeners
         self.page.on("load", self._on_page_load)
 
     async def close_browser(self):
         """
-        Closes the browser instance and cleans up resources.
+        Closes this instance's browser context; the shared browser stays up until shutdown().
         """
-        if self.browser:
-            await self.browser.close()
-            self.browser = None
-            self.page = None
-            self.is_authenticated = False
+        if self.context:
+            await self.context.close()
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.is_authenticated = False
+
+    async def _race_selectors(self, selectors: List[str], timeout: int) -> Optional[Tuple[str, ElementHandle]]:
+        """
+        Waits for all candidate selectors at once instead of one after another.
+
+        Args:
+            selectors: Candidate selectors, most preferred first.
+            timeout: Per-selector timeout in milliseconds.
+
+        Returns:
+            (selector, element) for the first candidate to appear, or None if all time out.
+            Among candidates that appear together the earlier one wins.
+        """
+        waits = {
+            asyncio.create_task(self.page.wait_for_selector(selector, timeout=timeout)): index
+            for index, selector in enumerate(selectors)
+        }
+        pending = set(waits)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=waits.__getitem__):
+                    if isinstance(task.exception(), TimeoutError):
+                        continue
+                    element = task.result()
+                    if element:
+                        return selectors[waits[task]], element
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
     def _on_page_load(self):
         """
@@ -61,8 +166,8 @@ class PlaywrightAutomation:
             raise RuntimeError("Browser not initialized")
 
         try:
-            await self.page.goto("https://gemini.google.com/app", wait_until="networkidle")
-            await self.page.wait_for_load_state("domcontentloaded")
+            # The interface wait below decides readiness; live pages rarely reach networkidle
+            await self.page.goto("https://gemini.google.com/app", wait_until="domcontentloaded")
 
             # Wait for the main interface to be ready
             await self._wait_for_gemini_interface()
@@ -86,13 +191,10 @@ class PlaywrightAutomation:
             ".gemini-chat-input"
         ]
 
-        for selector in selectors_to_wait:
-            try:
-                await self.page.wait_for_selector(selector, timeout=5000)
-                logger.info(f"Found Gemini interface element: {selector}")
-                return
-            except TimeoutError:
-                continue
+        found = await self._race_selectors(selectors_to_wait, timeout=5000)
+        if found:
+            logger.info(f"Found Gemini interface element: {found[0]}")
+            return
 
         logger.warning("Could not find expected Gemini interface elements")
 
@@ -158,29 +260,18 @@ class PlaywrightAutomation:
             "textarea[placeholder*='Ask']"
         ]
 
-        input_field = None
-        for selector in input_selectors:
-            try:
-                input_field = await self.page.wait_for_selector(selector, timeout=3000)
-                break
-            except TimeoutError:
-                continue
-
-        if not input_field:
+        found = await self._race_selectors(input_selectors, timeout=3000)
+        if not found:
             raise RuntimeError("Could not find input field for research query")
-
-        # Clear existing content and input the query
-        await input_field.clear()
-        await input_field.fill(query)
+        input_field = found[1]
 
         # Add mode-specific instructions
-        if mode == "comprehensive":
-            mode_instruction = "\n\nPlease provide a comprehensive analysis with multiple sources and detailed explanations."
-        elif mode == "focused":
-            mode_instruction = "\n\nPlease provide a focused analysis with key findings and main sources."
-        else:
+        mode_instruction = _MODE_INSTRUCTIONS.get(mode)
+        if mode_instruction is None:
             mode_instruction = f"\n\nPlease perform research in {mode} mode."
 
+        # Clear existing content and input the query
+        await input_field.clear()
         await input_field.fill(query + mode_instruction)
 
     async def _trigger_research_task(self):
@@ -199,20 +290,13 @@ class PlaywrightAutomation:
             "button:has-text('Send')"
         ]
 
-        submit_button = None
-        for selector in submit_selectors:
-            try:
-                submit_button = await self.page.wait_for_selector(selector, timeout=3000)
-                break
-            except TimeoutError:
-                continue
-
-        if not submit_button:
+        found = await self._race_selectors(submit_selectors, timeout=3000)
+        if not found:
             # Try pressing Enter in the input field as an alternative
             await self.page.keyboard.press("Enter")
             return
 
-        await submit_button.click()
+        await found[1].click()
 
     async def _extract_research_results(self) -> Dict[str, Any]:
         """
@@ -266,18 +350,13 @@ class PlaywrightAutomation:
 
         sources = []
         try:
-            # Look for links in the response
-            links = await self.page.query_selector_all("a[href]")
-
-            for link in links:
-                href = await link.get_attribute("href")
-                text = await link.inner_text()
-
-                if href and text.strip():
-                    sources.append({
-                        "title": text.strip(),
-                        "url": href
-                    })
+            # Read every link in the response in one round-trip to the browser
+            sources = await self.page.eval_on_selector_all(
+                "a[href]",
+                """links => links
+                    .map(link => ({title: link.innerText.trim(), url: link.getAttribute("href")}))
+                    .filter(source => source.title && source.url)"""
+            )
 
         except Exception as e:
             logger.warning(f"Error extracting sources: {str(e)}")
@@ -295,8 +374,7 @@ class PlaywrightAutomation:
             raise RuntimeError("Browser not initialized")
 
         try:
-            await self.page.goto(url, wait_until="networkidle")
-            await self.page.wait_for_load_state("domcontentloaded")
+            await self.page.goto(url, wait_until="domcontentloaded")
 
             # Wait for video player to be ready
             await self.page.wait_for_selector("video", timeout=10000)
@@ -327,19 +405,11 @@ class PlaywrightAutomation:
                 ".ytp-button[data-tooltip-target-id='ytp-subtitles-button']"
             ]
 
-            cc_button = None
-            for selector in cc_button_selectors:
-                try:
-                    cc_button = await self.page.wait_for_selector(selector, timeout=5000)
-                    if cc_button:
-                        break
-                except TimeoutError:
-                    continue
-
-            if not cc_button:
+            found = await self._race_selectors(cc_button_selectors, timeout=5000)
+            if not found:
                 raise RuntimeError("Could not find subtitles button")
 
-            await cc_button.click()
+            await found[1].click()
 
             # Wait for transcript option and click it
             transcript_selectors = [
@@ -348,17 +418,9 @@ class PlaywrightAutomation:
                 "[aria-label*='transcript']"
             ]
 
-            transcript_option = None
-            for selector in transcript_selectors:
-                try:
-                    transcript_option = await self.page.wait_for_selector(selector, timeout=5000)
-                    if transcript_option:
-                        break
-                except TimeoutError:
-                    continue
-
-            if transcript_option:
-                await transcript_option.click()
+            found = await self._race_selectors(transcript_selectors, timeout=5000)
+            if found:
+                await found[1].click()
 
             # Wait for transcript panel to appear
             await self.page.wait_for_selector(".ytd-transcript-renderer, .transcript-content", timeout=10000)
@@ -436,13 +498,23 @@ class PlaywrightAutomation:
         Returns:
             Dictionary containing processed transcript data and analysis.
         """
+        if not transcript or transcript.isspace():
+            # Nothing to analyze
+            return {
+                "cleaned_transcript": "",
+                "word_count": 0,
+                "sentence_count": 0,
+                "timestamps": [],
+                "key_topics": [],
+                "summary": ""
+            }
+
         # Clean the transcript
         cleaned_transcript = self._clean_transcript(transcript)
 
-        # Basic analysis
-        word_count = len(cleaned_transcript.split())
-        sentences = cleaned_transcript.split('.')
-        sentence_count = len([s for s in sentences if s.strip()])
+        # Basic analysis; the cleaned transcript is single-space separated
+        word_count = cleaned_transcript.count(' ') + 1 if cleaned_transcript else 0
+        sentence_count = sum(1 for _ in _SENTENCE_RE.finditer(cleaned_transcript))
 
         # Extract timestamps if available
         timestamps = self._extract_timestamps(transcript)
@@ -463,11 +535,8 @@ class PlaywrightAutomation:
         """
         Cleans the transcript text by removing timestamps and formatting.
         """
-        import re
-
         # Remove timestamp patterns like [0:00] or 0:00
-        cleaned = re.sub(r'\[\d+:\d+(?::\d+)?\]', '', transcript)
-        cleaned = re.sub(r'\d+:\d+(?::\d+)?', '', cleaned)
+        cleaned = _TS_RE.sub('', transcript)
 
         # Remove extra whitespace
         cleaned = ' '.join(cleaned.split())
@@ -478,13 +547,9 @@ class PlaywrightAutomation:
         """
         Extracts timestamps from the transcript.
         """
-        import re
-
         timestamps = []
         # Match patterns like [0:00] text or 0:00 text
-        timestamp_pattern = r'(?:\[)?(\d+):(\d+)(?::(\d+))?(?:\])?\s*(.*?)(?=(?:\[\d+:\d+(?::\d+)?\]|$|\d+:\d+(?::\d+)?))'
-
-        matches = re.findall(timestamp_pattern, transcript, re.DOTALL)
+        matches = _TS_EXTRACT_RE.findall(transcript)
 
         for match in matches:
             minutes = int(match[0])
@@ -506,18 +571,13 @@ class PlaywrightAutomation:
         """
         Extracts key topics from the transcript using simple keyword analysis.
         """
-        import re
-        from collections import Counter
-
-        # Remove common stop words
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'}
-
-        # Extract words
-        words = re.findall(r'\b\w+\b', transcript.lower())
-        words = [word for word in words if word not in stop_words and len(word) > 3]
+        # Topics are words longer than three characters
+        if len(transcript) < 4:
+            return []
 
-        # Count frequency
-        word_counts = Counter(words)
+        # Extract words, lowercased one at a time, and count all but common stop words
+        words = (match.group().lower() for match in _WORD_RE.finditer(transcript))
+        word_counts = Counter(word for word in words if len(word) > 3 and word not in _STOP_WORDS)
 
         # Get top 10 most common words as topics
         topics = [word for word, count in word_counts.most_common(10)]
@@ -528,25 +588,25 @@ class PlaywrightAutomation:
         """
         Generates a simple summary of the transcript.
         """
-        sentences = transcript.split('.')
-        sentences = [s.strip() for s in sentences if s.strip()]
+        # Locate the sentences without slicing them all out of the transcript
+        sentences = [match.span() for match in _SENTENCE_RE.finditer(transcript)]
 
         if len(sentences) <= 3:
             return transcript
 
         # Simple extractive summary: take first, middle, and last sentences
-        summary_sentences = []
-        if sentences:
-            summary_sentences.append(sentences[0])
-        if len(sentences) > 2:
-            summary_sentences.append(sentences[len(sentences) // 2])
-        if len(sentences) > 1:
-            summary_sentences.append(sentences[-1])
+        summary_sentences = (sentences[0], sentences[len(sentences) // 2], sentences[-1])
 
-        return '. '.join(summary_sentences) + '.'
+        return '. '.join(transcript[start:end].strip() for start, end in summary_sentences) + '.'
 
 async def get_playwright_automation() -> PlaywrightAutomation:
     """
     Dependency injection provider for PlaywrightAutomation.
     """
-    return PlaywrightAutomation()
\ No newline at end of file
+    return PlaywrightAutomation()
+
+async def shutdown_playwright_automation():
+    """
+    Closes the browser shared by PlaywrightAutomation instances.
+    """
+    await PlaywrightAutomation.shutdown()
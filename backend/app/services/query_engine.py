@@ -4,10 +4,15 @@ Processes node-based query graphs and executes them against data sources.
 """
 
 import asyncio
+import functools
+import itertools
 import json
+import operator
+import re
 import time
-from datetime import datetime
-from typing import Dict, List, Any, Optional, Union
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Any, Optional, Tuple, Union
 from abc import ABC, abstractmethod
 from enum import Enum
 import logging
@@ -23,6 +28,13 @@ class QueryNodeType(Enum):
     JOIN = "join"
     UNION = "union"
 
+# Node types by their graph value, for lookups without the Enum's exception path
+_NODE_TYPE_BY_VALUE = {nt.value: nt for nt in QueryNodeType}
+
+def _node_type_for(value: Any) -> Optional[QueryNodeType]:
+    """Look up a node type by its graph value; graphs are unvalidated JSON, so check the type first."""
+    return _NODE_TYPE_BY_VALUE.get(value) if isinstance(value, str) else None
+
 class ExecutionStatus(Enum):
     """Execution status of query nodes."""
     PENDING = "pending"
@@ -44,6 +56,8 @@ class QueryNode(ABC):
         self.result: Optional[Any] = None
         self.error: Optional[str] = None
         self.execution_time: Optional[float] = None
+        # Monotonic start, for timing without datetime arithmetic
+        self._started_at: Optional[float] = None
 
     @abstractmethod
     async def execute(self, input_data: Any = None, context: Dict[str, Any] = None) -> Any:
@@ -54,13 +68,16 @@ class QueryNode(ABC):
         """Mark node execution as started."""
         self.status = ExecutionStatus.RUNNING
         self.start_time = datetime.now()
+        self._started_at = time.perf_counter()
 
     def mark_completed(self, result: Any):
         """Mark node execution as completed."""
         self.status = ExecutionStatus.COMPLETED
-        self.end_time = datetime.now()
-        if self.start_time:
-            self.execution_time = (self.end_time - self.start_time).total_seconds()
+        if self._started_at is not None:
+            self.execution_time = time.perf_counter() - self._started_at
+            self.end_time = self.start_time + timedelta(seconds=self.execution_time)
+        else:
+            self.end_time = datetime.now()
         self.result = result
 
     def mark_failed(self, error: str):
@@ -70,14 +87,18 @@ class QueryNode(ABC):
         self.error = error
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert node to dictionary representation."""
+        """Convert node to dictionary representation.
+
+        Times stay datetimes; the response model and the orjson SSE encoder
+        write them as ISO 8601 strings when the result is serialized.
+        """
         return {
             'node_id': self.node_id,
             'node_type': self.node_type.value,
             'data': self.data,
             'status': self.status.value,
-            'start_time': self.start_time.isoformat() if self.start_time else None,
-            'end_time': self.end_time.isoformat() if self.end_time else None,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
             'execution_time': self.execution_time,
             'result': self.result,
             'error': self.error
@@ -233,11 +254,111 @@ class DataSourceNode(QueryNode):
                 {'id': 3, 'value': 'Sample Data 3'},
             ]
 
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    '>': operator.gt,
+    '<': operator.lt,
+}
+
+# Connectives outside quoted values; quoted values match without a group and are skipped
+_CONNECTIVE_RE = re.compile(r"""'[^']*'|"[^"]*"|\s+(and|or)\s+""", re.IGNORECASE)
+
+# Selectivity rank of each comparison kind: equality usually excludes the most rows
+_EQUALITY_RANK = 0
+_RANGE_RANK = 1
+
+RowPredicate = Callable[[Dict[str, Any]], bool]
+
+def _compile_comparison(condition: str) -> Optional[Tuple[int, RowPredicate]]:
+    """Compile a single comparison into (selectivity rank, row predicate), or None if not understood."""
+    # Simple condition parsing (e.g., "age > 25", "name = 'Alice'")
+    for symbol, compare in _COMPARISONS.items():
+        if symbol in condition:
+            field, value = condition.split(symbol, 1)
+            field = field.strip()
+            try:
+                threshold = float(value.strip())
+            except ValueError:
+                return None
+
+            def predicate(item: Dict[str, Any]) -> bool:
+                actual = item.get(field)
+                return isinstance(actual, (int, float)) and compare(actual, threshold)
+            return _RANGE_RANK, predicate
+
+    if '=' in condition:
+        field, value = condition.replace('==', '=').split('=', 1)
+        field = field.strip()
+        value = value.strip().strip("'\"")
+        return _EQUALITY_RANK, lambda item: str(item.get(field, '')) == value
+
+    return None
+
+def _all_of(predicates: List[RowPredicate]) -> RowPredicate:
+    if len(predicates) == 1:
+        return predicates[0]
+
+    def predicate(item: Dict[str, Any]) -> bool:
+        for check in predicates:
+            if not check(item):
+                return False
+        return True
+    return predicate
+
+def _any_of(predicates: List[RowPredicate]) -> RowPredicate:
+    if len(predicates) == 1:
+        return predicates[0]
+
+    def predicate(item: Dict[str, Any]) -> bool:
+        for check in predicates:
+            if check(item):
+                return True
+        return False
+    return predicate
+
+def _compile_condition(condition: str) -> Optional[RowPredicate]:
+    """Compile a filter condition, possibly joined with and/or, into a row predicate.
+
+    "and" binds tighter than "or". Within each "and" group comparisons run most
+    selective first and stop at the first one a row fails. Returns None if the
+    condition is not understood.
+    """
+    # Split into "or" groups of "and"-joined comparisons
+    groups: List[List[str]] = [[]]
+    start = 0
+    for match in _CONNECTIVE_RE.finditer(condition):
+        connective = match.group(1)
+        if not connective:
+            continue
+        groups[-1].append(condition[start:match.start()])
+        if connective.lower() == 'or':
+            groups.append([])
+        start = match.end()
+    groups[-1].append(condition[start:])
+
+    if len(groups) == 1 and len(groups[0]) == 1:
+        compiled = _compile_comparison(condition)
+        return compiled[1] if compiled else None
+
+    alternatives = []
+    for group in groups:
+        comparisons = [_compile_comparison(term) for term in group]
+        if None in comparisons:
+            # Not a compound condition after all, e.g. an unquoted value containing "and"
+            compiled = _compile_comparison(condition)
+            return compiled[1] if compiled else None
+        comparisons.sort(key=lambda comparison: comparison[0])
+        alternatives.append(_all_of([predicate for _, predicate in comparisons]))
+
+    return _any_of(alternatives)
+
 class FilterNode(QueryNode):
     """Node for filtering data."""
 
     def __init__(self, node_id: str, data: Dict[str, Any]):
         super().__init__(node_id, QueryNodeType.FILTER, data)
+        # Row predicate compiled from the condition, so executions skip parsing
+        self._condition = data.get('condition', '')
+        self._predicate = _compile_condition(self._condition)
 
     async def execute(self, input_data: Any = None, context: Dict[str, Any] = None) -> Any:
         """Execute data filtering."""
@@ -269,31 +390,20 @@ class FilterNode(QueryNode):
         if not isinstance(data, list):
             return data
 
-        # Simple condition parsing (e.g., "age > 25", "name contains 'a'")
-        if '>' in condition:
-            field, value = condition.split('>', 1)
-            field = field.strip()
-            try:
-                threshold = float(value.strip())
-                return [item for item in data if isinstance(item.get(field), (int, float)) and item[field] > threshold]
-            except ValueError:
-                pass
-        elif '<' in condition:
-            field, value = condition.split('<', 1)
-            field = field.strip()
-            try:
-                threshold = float(value.strip())
-                return [item for item in data if isinstance(item.get(field), (int, float)) and item[field] < threshold]
-            except ValueError:
-                pass
-        elif '==' in condition or '=' in condition:
-            field, value = condition.replace('==', '=').split('=', 1)
-            field = field.strip()
-            value = value.strip().strip("'\"")
-            return [item for item in data if str(item.get(field, '')) == value]
+        if condition != self._condition:
+            self._condition = condition
+            self._predicate = _compile_condition(condition)
 
-        # Default: return original data if condition not understood
-        return data
+        if self._predicate is None:
+            # Default: return original data if condition not understood
+            return data
+        return list(filter(self._predicate, data))
+
+# Case transformations, applied to string values only
+_CASE_TRANSFORMS: Dict[str, Callable[[str], str]] = {
+    'uppercase': str.upper,
+    'lowercase': str.lower,
+}
 
 class TransformNode(QueryNode):
     """Node for transforming data."""
@@ -331,17 +441,17 @@ class TransformNode(QueryNode):
             return data
 
         # Simple transformation operations
-        if transformation.lower() == 'uppercase':
-            return [{k: str(v).upper() if isinstance(v, str) else v for k, v in item.items()} for item in data]
-        elif transformation.lower() == 'lowercase':
-            return [{k: str(v).lower() if isinstance(v, str) else v for k, v in item.items()} for item in data]
-        elif transformation.lower().startswith('add_field:'):
+        operation = transformation.lower()
+        if operation in _CASE_TRANSFORMS:
+            convert = _CASE_TRANSFORMS[operation]
+            return [{k: convert(v) if isinstance(v, str) else v for k, v in item.items()} for item in data]
+        elif operation.startswith('add_field:'):
             field_def = transformation.split(':', 1)[1]
             field_name, field_value = field_def.split('=', 1)
             field_name = field_name.strip()
             field_value = field_value.strip().strip("'\"")
             return [{**item, field_name: field_value} for item in data]
-        elif transformation.lower().startswith('calculate:'):
+        elif operation.startswith('calculate:'):
             calc_def = transformation.split(':', 1)[1]
             # Simple calculation support
             return data  # Placeholder for more complex calculations
@@ -384,30 +494,45 @@ class AggregateNode(QueryNode):
             return data
 
         # Simple aggregation operations
-        if aggregation.lower() == 'count':
+        operation = aggregation.lower()
+        if operation == 'count':
             return {'count': len(data)}
-        elif aggregation.lower() == 'sum' and len(data) > 0:
-            # Try to sum numeric fields
-            first_item = data[0]
-            result = {}
-            for key, value in first_item.items():
-                if isinstance(value, (int, float)):
-                    total = sum(item.get(key, 0) for item in data)
-                    result[key] = total
-            return result
-        elif aggregation.lower() == 'average' and len(data) > 0:
-            # Try to average numeric fields
-            first_item = data[0]
-            result = {}
-            for key, value in first_item.items():
-                if isinstance(value, (int, float)):
-                    values = [item.get(key, 0) for item in data]
-                    average = sum(values) / len(values)
-                    result[key] = average
-            return result
+        elif operation == 'sum':
+            return self._numeric_totals(data)
+        elif operation == 'average':
+            count = len(data)
+            return {key: total / count for key, total in self._numeric_totals(data).items()}
 
         return data
 
+    def _numeric_totals(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Total each field that is numeric in the first row, in one reduction per field."""
+        # A builtin sum over a per-field list comprehension outruns a single
+        # row-major pass updating every total in the interpreter
+        return {
+            key: sum([item.get(key, 0) for item in data])
+            for key, value in data[0].items()
+            if isinstance(value, (int, float))
+        }
+
+# Join type -> (keep unmatched left rows, keep unmatched right rows)
+_JOIN_TYPES = {
+    'inner': (False, False),
+    'left': (True, False),
+    'right': (False, True),
+    'full': (True, True),
+    'outer': (True, True),
+}
+
+def _parse_join_keys(condition: str) -> Optional[Tuple[str, str]]:
+    """Parse "left.id == right.user_id" (side prefixes optional) into (left key, right key)."""
+    left, separator, right = condition.replace('==', '=').partition('=')
+    left_key = left.strip().removeprefix('left.')
+    right_key = right.strip().removeprefix('right.')
+    if not separator or not left_key or not right_key:
+        return None
+    return left_key, right_key
+
 class JoinNode(QueryNode):
     """Node for joining data from multiple sources."""
 
@@ -439,10 +564,51 @@ class JoinNode(QueryNode):
             raise
 
     def _apply_join(self, data: Any, join_type: str, condition: str) -> Any:
-        """Apply join operation."""
-        # Simplified join implementation
-        # In reality, this would handle left/right/inner/outer joins properly
-        return data
+        """Hash join two upstream inputs, which arrive as [left_rows, right_rows].
+
+        Anything else, or a condition without a key comparison, passes
+        through unchanged.
+        """
+        if not (len(data) == 2 and all(isinstance(side, list) for side in data)):
+            return data
+
+        keys = _parse_join_keys(condition)
+        if keys is None:
+            return data
+
+        join_type = join_type.lower()
+        if join_type not in _JOIN_TYPES:
+            raise ValueError(f"Unsupported join type: {join_type}")
+        keep_left, keep_right = _JOIN_TYPES[join_type]
+
+        left_key, right_key = keys
+        left_rows, right_rows = data
+
+        # Build: bucket right row indices by key; missing keys never match
+        buckets: Dict[Any, List[int]] = {}
+        for index, row in enumerate(right_rows):
+            key = row.get(right_key)
+            if key is not None:
+                buckets.setdefault(key, []).append(index)
+
+        # Probe with each left row, keeping left row order
+        joined = []
+        matched_right = set()
+        for row in left_rows:
+            key = row.get(left_key)
+            matches = buckets.get(key, ()) if key is not None else ()
+            for index in matches:
+                joined.append({**row, **right_rows[index]})
+            if matches:
+                if keep_right:
+                    matched_right.update(matches)
+            elif keep_left:
+                joined.append(row)
+
+        if keep_right:
+            joined.extend(row for index, row in enumerate(right_rows) if index not in matched_right)
+
+        return joined
 
 class UnionNode(QueryNode):
     """Node for combining data from multiple sources."""
@@ -473,21 +639,26 @@ class UnionNode(QueryNode):
     def _apply_union(self, data: Any) -> Any:
         """Apply union operation."""
         if isinstance(data, list) and all(isinstance(item, list) for item in data):
-            # Combine multiple lists
-            return [item for sublist in data for item in sublist]
+            # Combine multiple lists, concatenating in C rather than per row
+            return list(itertools.chain.from_iterable(data))
         return data
 
+# Upper bound on nodes of one execution level running at once
+MAX_CONCURRENT_NODES = 8
+
 class QueryExecutionEngine:
     """Engine for executing query graphs."""
 
-    def __init__(self):
-        self.node_factory = {
-            QueryNodeType.DATA_SOURCE: lambda id, data: DataSourceNode(id, data),
-            QueryNodeType.FILTER: lambda id, data: FilterNode(id, data),
-            QueryNodeType.TRANSFORM: lambda id, data: TransformNode(id, data),
-            QueryNodeType.AGGREGATE: lambda id, data: AggregateNode(id, data),
-            QueryNodeType.JOIN: lambda id, data: JoinNode(id, data),
-            QueryNodeType.UNION: lambda id, data: UnionNode(id, data),
+    def __init__(self, max_concurrent_nodes: int = MAX_CONCURRENT_NODES):
+        self.max_concurrent_nodes = max_concurrent_nodes
+        # Node classes by type; each takes (node_id, data)
+        self.node_factory: Dict[QueryNodeType, Callable[[str, Dict[str, Any]], QueryNode]] = {
+            QueryNodeType.DATA_SOURCE: DataSourceNode,
+            QueryNodeType.FILTER: FilterNode,
+            QueryNodeType.TRANSFORM: TransformNode,
+            QueryNodeType.AGGREGATE: AggregateNode,
+            QueryNodeType.JOIN: JoinNode,
+            QueryNodeType.UNION: UnionNode,
         }
         # Initialize service integrations
         self._initialize_services()
@@ -525,8 +696,12 @@ class QueryExecutionEngine:
             node_type_str = node_data.get('type', '')
             node_data_dict = node_data.get('data', {})
 
+            node_type = _node_type_for(node_type_str)
+            if node_type is None:
+                logger.error(f"Failed to create node {node_id}: {node_type_str!r} is not a valid QueryNodeType")
+                continue
+
             try:
-                node_type = QueryNodeType(node_type_str)
                 node = self.node_factory[node_type](node_id, node_data_dict)
                 nodes[node_id] = node
             except (KeyError, ValueError) as e:
@@ -550,23 +725,19 @@ class QueryExecutionEngine:
                 indegree[target] += 1
 
         # Find nodes with no incoming edges (data sources)
-        queue = [node_id for node_id in indegree if indegree[node_id] == 0]
+        level = [node_id for node_id in indegree if indegree[node_id] == 0]
         result = []
 
-        while queue:
-            level = []
-            for _ in range(len(queue)):
-                node_id = queue.pop(0)
-                level.append(node_id)
-
+        while level:
+            result.append(level)
+            next_level = []
+            for node_id in level:
                 # Reduce indegree of neighbors
                 for neighbor in adj_list[node_id]:
                     indegree[neighbor] -= 1
                     if indegree[neighbor] == 0:
-                        queue.append(neighbor)
-
-            if level:
-                result.append(level)
+                        next_level.append(neighbor)
+            level = next_level
 
         # Check for cycles (if not all nodes are processed)
         if len(result) == 0 or sum(len(level) for level in result) < len(nodes):
@@ -578,7 +749,7 @@ class QueryExecutionEngine:
 
     async def execute_query_graph(self, query_graph: Dict[str, Any], context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Execute a complete query graph."""
-        start_time = datetime.now()
+        start_time = time.perf_counter()
 
         try:
             # Parse nodes
@@ -592,39 +763,33 @@ class QueryExecutionEngine:
             # Prepare execution context with services
             execution_context = self._prepare_execution_context(context or {})
 
-            # Execute nodes in order
-            execution_results = []
+            # Execute levels in order, the nodes within a level concurrently
+            incoming = self._build_incoming(edges)
+            results_by_id = {}
+            slots = asyncio.Semaphore(self.max_concurrent_nodes)
             for level in execution_order:
-                level_results = {}
-
-                for node_id in level:
-                    if node_id in nodes:
-                        node = nodes[node_id]
-                        try:
-                            # Get input data from previous results
-                            input_data = self._get_node_input(node_id, edges, execution_results)
-                            result = await node.execute(input_data, execution_context)
-                            level_results[node_id] = result
-                        except Exception as e:
-                            logger.error(f"Node {node_id} execution failed: {e}")
-                            node.mark_failed(str(e))
-
-                execution_results.append(level_results)
+                outcomes = await asyncio.gather(*(
+                    self._run_node(nodes[node_id], incoming, results_by_id, execution_context, slots)
+                    for node_id in level if node_id in nodes
+                ))
+                for node, result, error in outcomes:
+                    if error is None:
+                        results_by_id[node.node_id] = result
+                    else:
+                        logger.error(f"Node {node.node_id} execution failed: {error}")
+                        node.mark_failed(str(error))
 
             # Collect final results
-            final_results = {}
-            execution_time = (datetime.now() - start_time).total_seconds()
-
-            for node in nodes.values():
-                final_results[node.node_id] = node.to_dict()
+            execution_time = time.perf_counter() - start_time
+            final_results, completed_nodes, failed_nodes = self._collect_results(nodes)
 
             return {
                 'success': True,
                 'results': final_results,
                 'execution_time': execution_time,
                 'total_nodes': len(nodes),
-                'completed_nodes': len([n for n in nodes.values() if n.status == ExecutionStatus.COMPLETED]),
-                'failed_nodes': len([n for n in nodes.values() if n.status == ExecutionStatus.FAILED])
+                'completed_nodes': completed_nodes,
+                'failed_nodes': failed_nodes
             }
 
         except Exception as e:
@@ -633,12 +798,12 @@ class QueryExecutionEngine:
             return {
                 'success': False,
                 'error': error_msg,
-                'execution_time': (datetime.now() - start_time).total_seconds()
+                'execution_time': time.perf_counter() - start_time
             }
 
     async def execute_query_graph_streaming(self, query_graph: Dict[str, Any], context: Dict[str, Any] = None):
         """Execute a query graph with streaming results."""
-        start_time = datetime.now()
+        start_time = time.perf_counter()
 
         try:
             # Parse nodes
@@ -661,9 +826,11 @@ class QueryExecutionEngine:
                 'execution_order': execution_order
             }
 
-            # Execute nodes in order with streaming
-            execution_results = []
+            # Execute levels in order with streaming, the nodes within a level concurrently
+            incoming = self._build_incoming(edges)
+            results_by_id = {}
             completed_count = 0
+            slots = asyncio.Semaphore(self.max_concurrent_nodes)
 
             for level_idx, level in enumerate(execution_order):
                 level_results = {}
@@ -675,47 +842,53 @@ class QueryExecutionEngine:
                     'nodes': level
                 }
 
-                for node_id in level:
-                    if node_id in nodes:
-                        node = nodes[node_id]
-
-                        # Send node start
-                        yield {
-                            'type': 'node_start',
-                            'node_id': node_id,
-                            'node_type': node.node_type.value
-                        }
-
-                        try:
-                            # Get input data from previous results
-                            input_data = self._get_node_input(node_id, edges, execution_results)
-                            result = await node.execute(input_data, execution_context)
-
-                            level_results[node_id] = result
+                level_nodes = [nodes[node_id] for node_id in level if node_id in nodes]
+                for node in level_nodes:
+                    # Send node start
+                    yield {
+                        'type': 'node_start',
+                        'node_id': node.node_id,
+                        'node_type': node.node_type.value
+                    }
+
+                # Run the level concurrently, reporting nodes as they finish
+                tasks = [
+                    asyncio.ensure_future(self._run_node(node, incoming, results_by_id, execution_context, slots))
+                    for node in level_nodes
+                ]
+                try:
+                    for next_done in asyncio.as_completed(tasks):
+                        node, result, error = await next_done
+
+                        if error is None:
+                            level_results[node.node_id] = result
                             completed_count += 1
 
                             # Send node completion
                             yield {
                                 'type': 'node_complete',
-                                'node_id': node_id,
+                                'node_id': node.node_id,
                                 'result': result,
                                 'completed_count': completed_count,
                                 'total_nodes': len(nodes)
                             }
-
-                        except Exception as e:
-                            error_msg = str(e)
-                            logger.error(f"Node {node_id} execution failed: {error_msg}")
+                        else:
+                            error_msg = str(error)
+                            logger.error(f"Node {node.node_id} execution failed: {error_msg}")
                             node.mark_failed(error_msg)
 
                             # Send node failure
                             yield {
                                 'type': 'node_error',
-                                'node_id': node_id,
+                                'node_id': node.node_id,
                                 'error': error_msg
                             }
+                finally:
+                    # A client disconnect closes the stream mid-level
+                    for task in tasks:
+                        task.cancel()
 
-                execution_results.append(level_results)
+                results_by_id.update(level_results)
 
                 # Send level completion
                 yield {
@@ -725,25 +898,22 @@ class QueryExecutionEngine:
                 }
 
             # Send final results
-            final_results = {}
-            execution_time = (datetime.now() - start_time).total_seconds()
-
-            for node in nodes.values():
-                final_results[node.node_id] = node.to_dict()
+            execution_time = time.perf_counter() - start_time
+            final_results, completed_nodes, failed_nodes = self._collect_results(nodes)
 
             yield {
                 'type': 'complete',
                 'success': True,
                 'results': final_results,
                 'execution_time': execution_time,
-                'completed_nodes': len([n for n in nodes.values() if n.status == ExecutionStatus.COMPLETED]),
-                'failed_nodes': len([n for n in nodes.values() if n.status == ExecutionStatus.FAILED])
+                'completed_nodes': completed_nodes,
+                'failed_nodes': failed_nodes
             }
 
         except Exception as e:
             error_msg = f"Query graph execution failed: {str(e)}"
             logger.error(error_msg)
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = time.perf_counter() - start_time
 
             yield {
                 'type': 'error',
@@ -751,24 +921,42 @@ class QueryExecutionEngine:
                 'execution_time': execution_time
             }
 
-    def _get_node_input(self, node_id: str, edges: List[Dict[str, str]], execution_results: List[Dict[str, Any]]) -> Any:
-        """Get input data for a node from previous execution results."""
-        # Find edges that target this node
-        input_edges = [edge for edge in edges if edge.get('target') == node_id]
-
-        if not input_edges:
-            return None
-
-        # Collect results from all source nodes
-        input_data = []
-        for edge in input_edges:
+    def _collect_results(self, nodes: Dict[str, QueryNode]) -> Tuple[Dict[str, Any], int, int]:
+        """Report every node and count completed and failed nodes in one pass."""
+        final_results = {}
+        completed = failed = 0
+        for node in nodes.values():
+            final_results[node.node_id] = node.to_dict()
+            if node.status == ExecutionStatus.COMPLETED:
+                completed += 1
+            elif node.status == ExecutionStatus.FAILED:
+                failed += 1
+        return final_results, completed, failed
+
+    async def _run_node(self, node: QueryNode, incoming: Dict[str, List[str]], results_by_id: Dict[str, Any],
+                        context: Dict[str, Any], slots: asyncio.Semaphore) -> Tuple[QueryNode, Any, Optional[Exception]]:
+        """Execute one node once a slot is free, returning (node, result, error)."""
+        async with slots:
+            try:
+                # Get input data from previous results
+                input_data = self._get_node_input(node.node_id, incoming, results_by_id)
+                return node, await node.execute(input_data, context), None
+            except Exception as e:
+                return node, None, e
+
+    def _build_incoming(self, edges: List[Dict[str, str]]) -> Dict[str, List[str]]:
+        """Map each node id to the source ids of its incoming edges, in edge order."""
+        incoming = defaultdict(list)
+        for edge in edges:
             source_id = edge.get('source')
             if source_id:
-                # Find the result from any execution level
-                for level_results in reversed(execution_results):
-                    if source_id in level_results:
-                        input_data.append(level_results[source_id])
-                        break
+                incoming[edge.get('target')].append(source_id)
+        return incoming
+
+    def _get_node_input(self, node_id: str, incoming: Dict[str, List[str]], results_by_id: Dict[str, Any]) -> Any:
+        """Get input data for a node from the results of its source nodes."""
+        # Sources that failed or were skipped have no result and contribute no input
+        input_data = [results_by_id[source_id] for source_id in incoming.get(node_id, ()) if source_id in results_by_id]
 
         # If only one input, return it directly
         if len(input_data) == 1:
@@ -795,52 +983,50 @@ class QueryExecutionEngine:
 
     def validate_query_graph(self, query_graph: Dict[str, Any]) -> Dict[str, Any]:
         """Validate a query graph structure."""
-        validation_result = {
-            'valid': True,
-            'errors': [],
-            'warnings': []
-        }
+        errors: List[str] = []
+        warnings: List[str] = []
+        add_error = errors.append
 
         nodes = query_graph.get('nodes', [])
         edges = query_graph.get('edges', [])
 
         if not nodes:
-            validation_result['errors'].append("Query graph must contain at least one node")
-            validation_result['valid'] = False
+            add_error("Query graph must contain at least one node")
 
         # Check for required node properties
+        node_ids = set()
         for i, node in enumerate(nodes):
-            if not node.get('id'):
-                validation_result['errors'].append(f"Node {i} missing required 'id' property")
-                validation_result['valid'] = False
-
-            if not node.get('type'):
-                validation_result['errors'].append(f"Node {node.get('id', i)} missing required 'type' property")
-                validation_result['valid'] = False
+            node_id = node.get('id')
+            if node_id:
+                node_ids.add(node_id)
+            else:
+                add_error(f"Node {i} missing required 'id' property")
 
             node_type = node.get('type')
-            if node_type and node_type not in [nt.value for nt in QueryNodeType]:
-                validation_result['warnings'].append(f"Unknown node type: {node_type}")
-
-        # Check edge validity
-        node_ids = {node['id'] for node in nodes}
-        for edge in edges:
-            if edge.get('source') not in node_ids:
-                validation_result['errors'].append(f"Edge source '{edge.get('source')}' not found in nodes")
-                validation_result['valid'] = False
+            if not node_type:
+                add_error(f"Node {node.get('id', i)} missing required 'type' property")
+            elif _node_type_for(node_type) is None:
+                warnings.append(f"Unknown node type: {node_type}")
+
+        # Check edge validity; with no valid nodes the graph is already rejected
+        if node_ids:
+            for edge in edges:
+                source = edge.get('source')
+                if source not in node_ids:
+                    add_error(f"Edge source '{source}' not found in nodes")
+
+                target = edge.get('target')
+                if target not in node_ids:
+                    add_error(f"Edge target '{target}' not found in nodes")
 
-            if edge.get('target') not in node_ids:
-                validation_result['errors'].append(f"Edge target '{edge.get('target')}' not found in nodes")
-                validation_result['valid'] = False
-
-        return validation_result
-
-# Singleton instance
-_query_engine = None
+        return {
+            'valid': not errors,
+            'errors': errors,
+            'warnings': warnings
+        }
 
+# Singleton instance, built on first use
+@functools.lru_cache(maxsize=1)
 def get_query_engine() -> QueryExecutionEngine:
     """Get the query execution engine instance."""
-    global _query_engine
-    if _query_engine is None:
-        _query_engine = QueryExecutionEngine()
-    return _query_engine
\ No newline at end of file
+    return QueryExecutionEngine()
\ No newline at end of file
@@ -1,15 +1,22 @@
 import json
 import os
 import uuid
+from collections import Counter
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 import logging
 
-from ..models.workflow import Workflow, WorkflowMetadata
+from ..models.workflow import Workflow, WorkflowMetadata, WORKFLOW_ADAPTER
 
 logger = logging.getLogger(__name__)
 
+# Workflow files in storage are only ever written by save_workflow() from an
+# already-validated Workflow, so loading them can skip pydantic validation and
+# build the models with model_construct(). Switch this off if the models gain
+# validators or defaults that must run on load.
+TRUSTED_INTERNAL = True
+
 class WorkflowPersistenceService:
     """
     Service for persisting workflows (query graphs) to JSON files.
@@ -26,6 +33,10 @@ class WorkflowPersistenceService:
         # Initialize storage if needed
         self._initialize_storage()
 
+        # Running storage counters, kept current by save/delete so that
+        # get_storage_stats() never has to rescan the storage directory
+        self._stats = self._scan_storage_stats()
+
     def _initialize_storage(self):
         """Initialize storage files if they don't exist."""
         if not self._workflows_file.exists():
@@ -35,6 +46,33 @@ class WorkflowPersistenceService:
         """Save the workflows index to file."""
         with open(self._workflows_file, 'w', encoding='utf-8') as f:
             json.dump(index, f, indent=2, ensure_ascii=False)
+        if hasattr(self, "_stats"):
+            self._stats["index_size"] = self._file_size(self._workflows_file)
+
+    @staticmethod
+    def _file_size(path: Path) -> int:
+        """Return the size of a file in bytes, or 0 if it does not exist."""
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
+
+    def _scan_storage_stats(self) -> Dict[str, Any]:
+        """Build the storage counters with a single full scan (startup only)."""
+        index = self._load_workflows_index()
+        data_size = 0
+        for workflow_file in self.storage_dir.glob("*.json"):
+            if workflow_file != self._workflows_file:
+                data_size += self._file_size(workflow_file)
+        for version_file in self._versions_dir.glob("*.json"):
+            data_size += self._file_size(version_file)
+
+        return {
+            "count": len(index),
+            "by_category": Counter(entry.get("category") or "general" for entry in index.values()),
+            "data_size": data_size,
+            "index_size": self._file_size(self._workflows_file),
+        }
 
     def _load_workflows_index(self) -> Dict[str, Any]:
         """Load the workflows index from file."""
@@ -102,16 +140,27 @@ class WorkflowPersistenceService:
 
             # Save current version to versions directory
             version_file = self._get_version_file_path(workflow.id, workflow.metadata.version)
+            previous_size = self._file_size(version_file)
             with open(version_file, 'w', encoding='utf-8') as f:
                 json.dump(workflow_dict, f, indent=2, ensure_ascii=False)
 
             # Save to main workflow file
             workflow_file = self._get_workflow_file_path(workflow.id)
+            previous_size += self._file_size(workflow_file)
             with open(workflow_file, 'w', encoding='utf-8') as f:
                 json.dump(workflow_dict, f, indent=2, ensure_ascii=False)
 
+            self._stats["data_size"] += (
+                self._file_size(version_file) + self._file_size(workflow_file) - previous_size
+            )
+
             # Update index
             index = self._load_workflows_index()
+            previous_entry = index.get(workflow.id)
+            if previous_entry:
+                self._stats["by_category"][previous_entry.get("category") or "general"] -= 1
+            else:
+                self._stats["count"] += 1
             index[workflow.id] = {
                 "id": workflow.id,
                 "name": workflow.name,
@@ -127,6 +176,7 @@ class WorkflowPersistenceService:
                 "edgeCount": workflow.edgeCount,
                 "thumbnail": workflow.metadata.thumbnail if workflow.metadata else None
             }
+            self._stats["by_category"][index[workflow.id]["category"] or "general"] += 1
             self._save_workflows_index(index)
 
             logger.info(f"Workflow saved: {workflow.id} (v{workflow.metadata.version}) by user {user_id or 'unknown'}")
@@ -154,7 +204,7 @@ class WorkflowPersistenceService:
             with open(workflow_file, 'r', encoding='utf-8') as f:
                 workflow_dict = json.load(f)
 
-            workflow = self._dict_to_workflow(workflow_dict)
+            workflow = self._dict_to_workflow(workflow_dict, trusted=TRUSTED_INTERNAL)
             logger.info(f"Workflow loaded: {workflow_id}")
             return workflow
 
@@ -162,6 +212,24 @@ class WorkflowPersistenceService:
             logger.error(f"Failed to load workflow {workflow_id}: {str(e)}")
             return None
 
+    def get_workflow_revision(self, workflow_id: str) -> Optional[Tuple[int, str]]:
+        """
+        Look up the current version and last update time of a workflow from the index.
+
+        The version restarts at 1 when a deleted workflow is recreated under the
+        same ID, so the update time is needed to tell the two apart.
+
+        Args:
+            workflow_id: The workflow ID
+
+        Returns:
+            A (version, updatedAt) tuple or None if not found
+        """
+        entry = self._load_workflows_index().get(workflow_id)
+        if not entry:
+            return None
+        return entry.get("version", 1), entry.get("updatedAt") or ""
+
     def delete_workflow(self, workflow_id: str) -> bool:
         """
         Delete a workflow from persistent storage.
@@ -178,16 +246,20 @@ class WorkflowPersistenceService:
             if workflow_id not in index:
                 return False
 
-            del index[workflow_id]
+            removed_entry = index.pop(workflow_id)
+            self._stats["count"] -= 1
+            self._stats["by_category"][removed_entry.get("category") or "general"] -= 1
             self._save_workflows_index(index)
 
             # Remove workflow file
             workflow_file = self._get_workflow_file_path(workflow_id)
             if workflow_file.exists():
+                self._stats["data_size"] -= self._file_size(workflow_file)
                 workflow_file.unlink()
 
             # Remove all versions
             for version_file in self._versions_dir.glob(f"{workflow_id}_v*.json"):
+                self._stats["data_size"] -= self._file_size(version_file)
                 version_file.unlink()
 
             logger.info(f"Workflow deleted: {workflow_id}")
@@ -472,33 +544,36 @@ class WorkflowPersistenceService:
             "edges": [edge.model_dump(by_alias=True) for edge in workflow.edges]
         }
 
-    def _dict_to_workflow(self, workflow_dict: Dict[str, Any]) -> Workflow:
-        """Convert dictionary to Workflow object."""
+    def _dict_to_workflow(self, workflow_dict: Dict[str, Any], trusted: bool = False) -> Workflow:
+        """
+        Convert dictionary to Workflow object.
+
+        Args:
+            workflow_dict: The workflow dictionary
+            trusted: True if the dictionary was written by this service, in which
+                case the models are built without validation
+        """
         from ..models.workflow import Node, Edge
 
-        metadata = None
-        if workflow_dict.get("metadata"):
-            metadata = WorkflowMetadata(**workflow_dict["metadata"])
-
-        nodes = []
-        for node_data in workflow_dict.get("nodes", []):
-            # Handle extra fields in nodes
-            node = Node(**node_data)
-            nodes.append(node)
-
-        edges = []
-        for edge_data in workflow_dict.get("edges", []):
-            edge = Edge(**edge_data)
-            edges.append(edge)
-
-        return Workflow(
-            id=workflow_dict["id"],
-            name=workflow_dict["name"],
-            description=workflow_dict.get("description"),
-            metadata=metadata,
-            nodes=nodes,
-            edges=edges
-        )
+        if trusted:
+            metadata_dict = workflow_dict.get("metadata")
+            return Workflow.model_construct(
+                id=workflow_dict["id"],
+                name=workflow_dict["name"],
+                description=workflow_dict.get("description"),
+                metadata=WorkflowMetadata.model_construct(**metadata_dict) if metadata_dict else None,
+                nodes=[Node.model_construct(**node_data) for node_data in workflow_dict.get("nodes", [])],
+                edges=[Edge.model_construct(**edge_data) for edge_data in workflow_dict.get("edges", [])]
+            )
+
+        return WORKFLOW_ADAPTER.validate_python({
+            "id": workflow_dict["id"],
+            "name": workflow_dict["name"],
+            "description": workflow_dict.get("description"),
+            "metadata": workflow_dict.get("metadata") or None,
+            "nodes": workflow_dict.get("nodes", []),
+            "edges": workflow_dict.get("edges", [])
+        })
 
     def detect_conflicts(self, workflow_id: str, user_version: int, user_id: str) -> Dict[str, Any]:
         """
@@ -569,34 +644,14 @@ class WorkflowPersistenceService:
             }
 
     def get_storage_stats(self) -> Dict[str, Any]:
-        """Get storage statistics."""
-        try:
-            index = self._load_workflows_index()
-            total_workflows = len(index)
-
-            # Calculate total size
-            total_size = 0
-            for workflow_file in self.storage_dir.glob("*.json"):
-                if workflow_file.exists():
-                    total_size += workflow_file.stat().st_size
-
-            for version_file in self._versions_dir.glob("*.json"):
-                if version_file.exists():
-                    total_size += version_file.stat().st_size
-
-            return {
-                "totalWorkflows": total_workflows,
-                "totalSize": total_size,
-                "storagePath": str(self.storage_dir)
-            }
-
-        except Exception as e:
-            logger.error(f"Failed to get storage stats: {str(e)}")
-            return {
-                "totalWorkflows": 0,
-                "totalSize": 0,
-                "storagePath": str(self.storage_dir)
-            }
+        """Get storage statistics from the running counters."""
+        stats = self._stats
+        return {
+            "totalWorkflows": stats["count"],
+            "totalSize": stats["data_size"] + stats["index_size"],
+            "byCategory": {category: count for category, count in stats["by_category"].items() if count > 0},
+            "storagePath": str(self.storage_dir)
+        }
 
 
 # Singleton instance
@@ -1,11 +1,15 @@
 from typing import Dict, List, Optional, Any, Tuple
+from collections import OrderedDict
 from datetime import datetime
 import uuid
 import logging
 import asyncio
+import copy
+import hashlib
 import json
 import re
 import sys
+import time
 from pathlib import Path
 
 # Add backend to path for imports
@@ -23,13 +27,19 @@ except ImportError:
         default_registry = None
 
 from providers import ProviderManager, GeminiDeepResearchProvider, PerplexityProvider
-from ..models.workflow import Workflow, Run, Result
+from ..models.workflow import Workflow, Run, Result, NODE_LIST_ADAPTER, EDGE_LIST_ADAPTER
 from .query_optimizer import QueryOptimizer, OptimizationLevel, get_query_optimizer
 from .artifact_service import ArtifactService, get_artifact_service
 from ..utils.schema_validator import workflow_schema_validator
 
 logger = logging.getLogger(__name__)
 
+# How long a computed stats snapshot is served before the runs are re-scanned
+STATS_CACHE_TTL_SECONDS = 5.0
+
+# Number of successful execution results kept for runs that opt into reuse
+EXECUTION_CACHE_SIZE = 128
+
 class WorkflowService:
     """
     Service for managing and executing workflows.
@@ -40,6 +50,10 @@ class WorkflowService:
         self.runs: Dict[str, Run] = {}
         self.results: Dict[str, Result] = {}
         self.event_queues: Dict[str, asyncio.Queue] = {}  # For SSE streaming
+        self._stats_snapshot: Optional[Dict[str, Any]] = None
+        self._stats_snapshot_at = 0.0
+        # Cached results, with the per-node content signatures of the run that produced them
+        self._execution_cache: "OrderedDict[str, Tuple[Dict[str, Any], Dict[str, str]]]" = OrderedDict()
         self.selectors_registry = default_registry
         self.dag_executor = DAGExecutor()
 
@@ -167,8 +181,19 @@ class WorkflowService:
             context = self._prepare_execution_context(execution_options or {})
             self.dag_executor.add_event_callback(event_callback)
 
-            # Execute workflow using schema-driven DAG executor
-            execution_result = await self.dag_executor.execute_workflow(workflow, context)
+            # Reuse a previous result for identical content when the caller opts in
+            cache_key = None
+            execution_result = None
+            if (execution_options or {}).get("reuse_results"):
+                cache_key = self._execution_cache_key(workflow, execution_options)
+                execution_result = self._get_cached_execution(cache_key, workflow)
+                execution_summary["cache_hit"] = execution_result is not None
+
+            if execution_result is None:
+                # Execute workflow using schema-driven DAG executor
+                execution_result = await self.dag_executor.execute_workflow(workflow, context)
+                if cache_key and execution_result.get("success", False):
+                    self._cache_execution(cache_key, execution_result, workflow)
             node_results = execution_result.get("node_results") or execution_result.get("results") or {}
             node_results = self._normalize_node_result_errors(node_results)
             self._emit_legacy_node_finished_events(execution_result, node_results)
@@ -277,6 +302,49 @@ class WorkflowService:
 
         return (run_id, execution_summary)
 
+    def _execution_cache_key(self, workflow: Workflow, execution_options: Dict[str, Any]) -> Optional[str]:
+        """Key a run on the workflow's content signature and its execution options"""
+        try:
+            signature = workflow.content_signature
+        except ValueError:
+            return None
+        options = json.dumps(execution_options, sort_keys=True, default=str)
+        return hashlib.blake2b(f"{signature}:{options}".encode(), digest_size=16).hexdigest()
+
+    def _get_cached_execution(self, cache_key: Optional[str], workflow: Workflow) -> Optional[Dict[str, Any]]:
+        """Return a copy of a cached result, with its node ids mapped onto this workflow's nodes"""
+        if cache_key is None or cache_key not in self._execution_cache:
+            return None
+        self._execution_cache.move_to_end(cache_key)
+        execution_result, cached_signatures = self._execution_cache[cache_key]
+
+        # The key ignores node ids, so pair nodes that compute the same thing
+        ids_by_signature: Dict[str, List[str]] = {}
+        for node_id, signature in sorted(workflow.node_content_signatures.items()):
+            ids_by_signature.setdefault(signature, []).append(node_id)
+        id_map = {}
+        for node_id, signature in sorted(cached_signatures.items()):
+            id_map[node_id] = ids_by_signature[signature].pop(0)
+
+        return self._remap_node_ids(copy.deepcopy(execution_result), id_map)
+
+    @staticmethod
+    def _remap_node_ids(execution_result: Dict[str, Any], id_map: Dict[str, str]) -> Dict[str, Any]:
+        for key in ("node_results", "results", "node_exec_times"):
+            by_node = execution_result.get(key)
+            if isinstance(by_node, dict):
+                execution_result[key] = {id_map.get(node_id, node_id): value for node_id, value in by_node.items()}
+        execution_order = execution_result.get("execution_order")
+        if isinstance(execution_order, list):
+            execution_result["execution_order"] = [id_map.get(node_id, node_id) for node_id in execution_order]
+        return execution_result
+
+    def _cache_execution(self, cache_key: str, execution_result: Dict[str, Any], workflow: Workflow):
+        self._execution_cache[cache_key] = (copy.deepcopy(execution_result), workflow.node_content_signatures)
+        self._execution_cache.move_to_end(cache_key)
+        while len(self._execution_cache) > EXECUTION_CACHE_SIZE:
+            self._execution_cache.popitem(last=False)
+
     def _store_node_output_artifacts(
         self,
         run_id: str,
@@ -375,7 +443,7 @@ class WorkflowService:
             "run_id": run.id,
             "workflow_id": run.workflow_id,
             "status": run.status,
-            "started_at": run.started_at.isoformat() if run.started_at else None,
+            "started_at": run.started_at.isoformat(),
             "completed_at": run.completed_at.isoformat() if run.completed_at else None,
             "execution_time": run.execution_time,
             "execution_order": run.execution_order,
@@ -402,7 +470,15 @@ class WorkflowService:
         return True
 
     def get_workflow_stats(self) -> Dict[str, Any]:
-        """Get workflow execution statistics"""
+        """Get workflow execution statistics, served from a short-lived snapshot"""
+        now = time.monotonic()
+        if self._stats_snapshot is None or now - self._stats_snapshot_at > STATS_CACHE_TTL_SECONDS:
+            self._stats_snapshot = self._compute_workflow_stats()
+            self._stats_snapshot_at = now
+        return dict(self._stats_snapshot)
+
+    def _compute_workflow_stats(self) -> Dict[str, Any]:
+        """Scan all runs and results to build execution statistics"""
         total_runs = len(self.runs)
         completed_runs = sum(1 for run in self.runs.values() if run.status == "completed")
         failed_runs = sum(1 for run in self.runs.values() if run.status == "failed")
@@ -589,31 +665,30 @@ class WorkflowService:
 
     def _dict_to_workflow(self, workflow_dict: Dict[str, Any]) -> Workflow:
         """Convert dictionary back to Workflow object."""
-        from ..models.workflow import Node, Edge
-
-        nodes = []
-        for node_data in workflow_dict.get('nodes', []):
-            node = Node(
-                id=node_data['id'],
-                type=node_data.get('type'),
-                data=node_data.get('data', {}),
-                created_at=datetime.now().isoformat(),
-                updated_at=datetime.now().isoformat()
-            )
-            nodes.append(node)
-
-        edges = []
-        for edge_data in workflow_dict.get('edges', []):
-            edge = Edge(
-                id=edge_data.get('id', f"{edge_data.get('source')}_{edge_data.get('target')}"),
-                from_=edge_data.get('source'),
-                to=edge_data.get('target'),
-                meta={
+        now = datetime.now().isoformat()
+        nodes = NODE_LIST_ADAPTER.validate_python([
+            {
+                'id': node_data['id'],
+                'type': node_data.get('type'),
+                'data': node_data.get('data', {}),
+                'created_at': now,
+                'updated_at': now
+            }
+            for node_data in workflow_dict.get('nodes', [])
+        ])
+
+        edges = EDGE_LIST_ADAPTER.validate_python([
+            {
+                'id': edge_data.get('id', f"{edge_data.get('source')}_{edge_data.get('target')}"),
+                'from_': edge_data.get('source'),
+                'to': edge_data.get('target'),
+                'meta': {
                     'sourceHandle': edge_data.get('sourceHandle'),
                     'targetHandle': edge_data.get('targetHandle')
                 }
-            )
-            edges.append(edge)
+            }
+            for edge_data in workflow_dict.get('edges', [])
+        ])
 
         return Workflow(
             id=workflow_dict.get('id'),
@@ -712,6 +787,21 @@ class WorkflowService:
             logger.error(f"Performance analysis failed: {str(e)}")
             return {"error": str(e)}
 
+    async def execute_batch(self, requests: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Executes several workflows concurrently, each as its own run.
+
+        Args:
+            requests: Keyword arguments for execute_workflow, one dict per workflow.
+
+        Returns:
+            A (run_id, execution_summary) tuple or the raised exception for each request, in order.
+        """
+        return await asyncio.gather(
+            *(self.execute_workflow(**request) for request in requests),
+            return_exceptions=True
+        )
+
     def get_optimization_stats(self) -> Dict[str, Any]:
         """Get optimization statistics."""
         return {
@@ -1,7 +1,7 @@
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Set
 from datetime import datetime
 import asyncio
 import json
@@ -1620,14 +1620,14 @@ async def export_to_destination(data: Dict[str, Any], destination: str) -> Dict[
 from monitoring_service import monitoring_service
 
 # WebSocket connections for real-time updates
-active_websocket_connections: List[WebSocket] = []
-execution_websocket_connections: Dict[str, List[WebSocket]] = {}
+active_websocket_connections: Set[WebSocket] = set()
+execution_websocket_connections: Dict[str, Set[WebSocket]] = {}
 
 @app.websocket("/ws/dashboard")
 async def dashboard_websocket(websocket: WebSocket):
     """WebSocket endpoint for dashboard real-time updates."""
     await websocket.accept()
-    active_websocket_connections.append(websocket)
+    active_websocket_connections.add(websocket)
 
     try:
         while True:
@@ -1636,18 +1636,15 @@ async def dashboard_websocket(websocket: WebSocket):
             # For now, just echo back (could be used for client commands)
             await websocket.send_text(f"Echo: {data}")
     except WebSocketDisconnect:
-        if websocket in active_websocket_connections:
-            active_websocket_connections.remove(websocket)
+        active_websocket_connections.discard(websocket)
 
 @app.websocket("/ws/executions/{execution_id}")
 async def execution_websocket(websocket: WebSocket, execution_id: str):
     """WebSocket endpoint for real-time execution event streaming."""
     await websocket.accept()
 
-    # Initialize connections list for this execution if not exists
-    if execution_id not in execution_websocket_connections:
-        execution_websocket_connections[execution_id] = []
-    execution_websocket_connections[execution_id].append(websocket)
+    # Initialize connections set for this execution if not exists
+    execution_websocket_connections.setdefault(execution_id, set()).add(websocket)
 
     try:
         while True:
@@ -1655,7 +1652,7 @@ async def execution_websocket(websocket: WebSocket, execution_id: str):
             await websocket.receive_text()
     except WebSocketDisconnect:
         if execution_id in execution_websocket_connections:
-            execution_websocket_connections[execution_id].remove(websocket)
+            execution_websocket_connections[execution_id].discard(websocket)
             if not execution_websocket_connections[execution_id]:
                 del execution_websocket_connections[execution_id]
 
@@ -1728,7 +1725,8 @@ async def broadcast_dashboard_update(update_type: str, data: Dict[str, Any]):
     }
 
     disconnected_clients = []
-    for websocket in active_websocket_connections:
+    # Iterate over a snapshot; clients can connect or drop while we await sends
+    for websocket in list(active_websocket_connections):
         try:
             await websocket.send_text(json.dumps(message))
         except Exception as e:
@@ -1737,8 +1735,7 @@ async def broadcast_dashboard_update(update_type: str, data: Dict[str, Any]):
 
     # Clean up disconnected clients
     for client in disconnected_clients:
-        if client in active_websocket_connections:
-            active_websocket_connections.remove(client)
+        active_websocket_connections.discard(client)
 
 # Function to broadcast execution events to specific execution WebSocket clients
 async def broadcast_execution_event(execution_id: str, event_type: str, data: Dict[str, Any]):
@@ -1753,7 +1750,7 @@ async def broadcast_execution_event(execution_id: str, event_type: str, data: Di
     }
 
     disconnected_clients = []
-    for websocket in execution_websocket_connections[execution_id]:
+    for websocket in list(execution_websocket_connections[execution_id]):
         try:
             await websocket.send_text(json.dumps(message))
         except Exception as e:
@@ -1763,7 +1760,7 @@ async def broadcast_execution_event(execution_id: str, event_type: str, data: Di
     # Clean up disconnected clients
     for client in disconnected_clients:
         if execution_id in execution_websocket_connections:
-            execution_websocket_connections[execution_id].remove(client)
+            execution_websocket_connections[execution_id].discard(client)
             if not execution_websocket_connections[execution_id]:
                 del execution_websocket_connections[execution_id]
 
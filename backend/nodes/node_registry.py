@@ -8,12 +8,14 @@ supporting CRUD operations, validation, and integration with the node factory.
 import json
 import os
 import asyncio
-from typing import Dict, Any, List, Optional, Set
+from typing import Callable, Dict, Any, List, Optional, Set
 from pathlib import Path
 from datetime import datetime
 import hashlib
 import uuid
 
+import fastjsonschema
+
 from .node_factory import (
     CustomNodeDefinition,
     DynamicNodeFactory,
@@ -35,6 +37,8 @@ class NodeRegistry:
 
         self._definitions: Dict[str, CustomNodeDefinition] = {}
         self._metadata: Dict[str, Dict[str, Any]] = {}
+        # Compiled params_schema validators, keyed by node type
+        self.validators: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
 
         # Load existing data
         self._load_registry()
@@ -59,6 +63,13 @@ class NodeRegistry:
             except json.JSONDecodeError as e:
                 print(f"Warning: Failed to load registry metadata: {e}")
 
+    def _compile_validator(self, definition: CustomNodeDefinition):
+        """Compile and cache the params_schema validator for a definition"""
+        try:
+            self.validators[definition.type] = fastjsonschema.compile(definition.params_schema)
+        except fastjsonschema.JsonSchemaDefinitionException as e:
+            raise NodeValidationError(f"Invalid params schema for '{definition.type}': {e}")
+
     def _save_registry(self):
         """Save registry data to disk"""
         # Save definitions
@@ -85,8 +96,8 @@ class NodeRegistry:
             json.dump(self._metadata, f, indent=2, ensure_ascii=False)
 
     def register_node(self, definition: CustomNodeDefinition,
-                     user_id: Optional[str] = None) -> str:
-        """Register a new custom node definition"""
+                     user_id: Optional[str] = None, save: bool = True) -> str:
+        """Register a new custom node definition; pass save=False when the caller saves once after a batch"""
         # Validate definition
         node_factory.validate_definition(definition)
 
@@ -94,6 +105,8 @@ class NodeRegistry:
         if definition.type in self._definitions:
             raise NodeRegistrationError(f"Node type '{definition.type}' already exists")
 
+        self._compile_validator(definition)
+
         # Generate unique ID for this registration
         registration_id = str(uuid.uuid4())
 
@@ -101,10 +114,11 @@ class NodeRegistry:
         self._definitions[definition.type] = definition
 
         # Add metadata
+        now = datetime.now().isoformat()
         self._metadata[definition.type] = {
             "registration_id": registration_id,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
+            "created_at": now,
+            "updated_at": now,
             "user_id": user_id,
             "version": definition.version,
             "status": "active",
@@ -115,7 +129,8 @@ class NodeRegistry:
         node_factory.register_node_definition(definition)
 
         # Save to disk
-        self._save_registry()
+        if save:
+            self._save_registry()
 
         return registration_id
 
@@ -132,6 +147,8 @@ class NodeRegistry:
         if definition.type != node_type:
             raise NodeValidationError("Cannot change node type during update")
 
+        self._compile_validator(definition)
+
         # Update definition
         self._definitions[node_type] = definition
 
@@ -157,6 +174,7 @@ class NodeRegistry:
 
         # Remove from registry
         del self._definitions[node_type]
+        self.validators.pop(node_type, None)
 
         # Remove metadata
         self._metadata.pop(node_type, None)
@@ -197,6 +215,18 @@ class NodeRegistry:
         """Get metadata for a node"""
         return self._metadata.get(node_type)
 
+    def bulk_update_metadata(self, node_types: List[str], updates: Dict[str, Any]):
+        """Apply the same metadata updates to several nodes with a single save"""
+        changed = False
+        for node_type in node_types:
+            metadata = self._metadata.get(node_type)
+            if metadata is not None:
+                metadata.update(updates)
+                changed = True
+
+        if changed:
+            self._save_registry()
+
     def increment_usage(self, node_type: str):
         """Increment usage count for a node"""
         if node_type in self._metadata:
@@ -235,11 +265,19 @@ class NodeRegistry:
 
     def validate_node_config(self, node_type: str, config: Dict[str, Any]) -> Dict[str, Any]:
         """Validate node configuration against schema"""
-        definition = self.get_node(node_type)
-        if not definition:
-            raise NodeValidationError(f"Unknown node type: {node_type}")
-
-        return node_factory.validate_definition(definition)
+        validator = self.validators.get(node_type)
+        if validator is None:
+            definition = self.get_node(node_type)
+            if not definition:
+                raise NodeValidationError(f"Unknown node type: {node_type}")
+            self._compile_validator(definition)
+            validator = self.validators[node_type]
+
+        try:
+            validator(config)
+            return {"valid": True, "errors": []}
+        except fastjsonschema.JsonSchemaValueException as e:
+            return {"valid": False, "errors": [e.message]}
 
     def export_nodes(self, node_types: Optional[List[str]] = None) -> Dict[str, Any]:
         """Export node definitions to a dictionary"""
@@ -272,8 +310,8 @@ class NodeRegistry:
                 if node_type in self._definitions and not overwrite:
                     continue
 
-                # Register the node
-                registration_id = self.register_node(definition, user_id)
+                # Register the node; the whole import is saved once below
+                registration_id = self.register_node(definition, user_id, save=False)
 
                 # Restore metadata if available
                 if node_type in metadata:
@@ -0,0 +1,72 @@
+"""
+Test Artifact Service
+
+Tests for artifact storage, the per-run metadata journal and cleanup.
+"""
+
+import json
+from datetime import datetime
+
+from backend.app.services import artifact_service
+from backend.app.services.artifact_service import ArtifactService, JOURNAL_FILENAME
+
+
+class _Y2K(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2000, 1, 1)
+
+
+def test_store_artifact_appends_to_run_journal(tmp_path):
+    service = ArtifactService(storage_path=str(tmp_path))
+
+    first_id = service.store_artifact("run-1", "result.json", {"value": 1})
+    second_id = service.store_artifact("run-1", "notes.txt", "hello", content_type="text/plain")
+    service.close()
+
+    run_dir = tmp_path / "run-1"
+    assert not list(run_dir.glob("*.meta.json"))
+
+    lines = (run_dir / JOURNAL_FILENAME).read_text().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [first_id, second_id]
+
+    # A fresh instance recovers the run's artifacts from the journal
+    reloaded = ArtifactService(storage_path=str(tmp_path))
+    assert [artifact["name"] for artifact in reloaded.get_artifacts_for_run("run-1")] == ["result.json", "notes.txt"]
+
+
+def test_cleanup_rewrites_journal_without_removed_artifacts(tmp_path, monkeypatch):
+    service = ArtifactService(storage_path=str(tmp_path))
+
+    with monkeypatch.context() as m:
+        m.setattr(artifact_service, "datetime", _Y2K)
+        old_id = service.store_artifact("run-1", "old.txt", "old")
+    keep_id = service.store_artifact("run-1", "keep.txt", "keep")
+
+    assert service.cleanup_old_artifacts(days_old=30) == 1
+
+    run_dir = tmp_path / "run-1"
+    assert not (run_dir / f"{old_id}.data").exists()
+    lines = (run_dir / JOURNAL_FILENAME).read_text().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [keep_id]
+
+
+
+def test_cleanup_keeps_journal_entries_from_earlier_processes(tmp_path, monkeypatch):
+    earlier = ArtifactService(storage_path=str(tmp_path))
+    earlier_id = earlier.store_artifact("run-1", "earlier.txt", "earlier")
+    earlier.close()
+
+    # A restarted service only knows the artifacts it stored itself
+    service = ArtifactService(storage_path=str(tmp_path))
+    with monkeypatch.context() as m:
+        m.setattr(artifact_service, "datetime", _Y2K)
+        old_id = service.store_artifact("run-1", "old.txt", "old")
+
+    assert service.cleanup_old_artifacts(days_old=30) == 1
+
+    run_dir = tmp_path / "run-1"
+    lines = (run_dir / JOURNAL_FILENAME).read_text().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [earlier_id]
+    assert (run_dir / f"{earlier_id}.data").exists()
+    assert not (run_dir / f"{old_id}.data").exists()
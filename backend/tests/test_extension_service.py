@@ -0,0 +1,55 @@
+"""
+Test Extension Service
+
+Tests for the extension capture store and its event-log persistence.
+"""
+
+from backend.app.services.extension_service import COMPACTION_RATIO, ExtensionDataStore
+
+
+def make_store(tmp_path):
+    store = ExtensionDataStore()
+    store.data_file = tmp_path / "extension_data.jsonl"
+    store.legacy_data_file = tmp_path / "extension_data.json"
+    return store
+
+
+def test_event_log_replays_captures_and_processing(tmp_path):
+    store = make_store(tmp_path)
+    alice_id = store.save_chat_capture({"userId": "alice", "site": "chatgpt"})
+    bob_id = store.save_chat_capture({"userId": "bob", "site": "claude"})
+    store.mark_as_processed(alice_id, "alice")
+
+    reloaded = make_store(tmp_path)
+    reloaded._load_data()
+
+    assert reloaded.get_user_data("alice")[alice_id]["metadata"]["processed"] is True
+    assert reloaded.get_unprocessed_data("bob")[0]["id"] == bob_id
+
+
+def test_event_log_compacts_when_stale(tmp_path):
+    store = make_store(tmp_path)
+    capture_id = store.save_chat_capture({"userId": "alice"})
+    for _ in range(10):
+        store.mark_as_processed(capture_id, "alice")
+
+    assert len(store.data_file.read_text().splitlines()) <= COMPACTION_RATIO
+
+    reloaded = make_store(tmp_path)
+    reloaded._load_data()
+    assert reloaded.get_user_data("alice")[capture_id]["metadata"]["processed"] is True
+
+
+def test_user_stats_follow_saves_processing_and_replay(tmp_path):
+    store = make_store(tmp_path)
+    alice_id = store.save_chat_capture({"userId": "alice", "site": "chatgpt"})
+    store.save_chat_capture({"userId": "bob", "site": "claude"})
+    store.mark_as_processed(alice_id, "alice")
+
+    assert store.get_stats("alice") == {"total": 1, "processed": 1, "sites": {"chatgpt": 1}}
+    assert store.get_stats("bob") == {"total": 1, "processed": 0, "sites": {"claude": 1}}
+
+    reloaded = make_store(tmp_path)
+    reloaded._load_data()
+    assert reloaded.get_stats("alice") == store.get_stats("alice")
+    assert reloaded.get_stats("bob") == store.get_stats("bob")
@@ -0,0 +1,68 @@
+"""
+Test Obsidian Service
+
+Tests for rendering and saving notes to an Obsidian vault.
+"""
+
+import asyncio
+from pathlib import Path
+
+import yaml
+
+from backend.app.services.obsidian_service import ObsidianService
+
+
+def test_save_workflow_results_async_writes_each_supported_task(tmp_path):
+    service = ObsidianService(vault_path=str(tmp_path))
+    results = {
+        "task-1": {"task_type": "deep_research", "query": "Heat pumps", "result": "Efficient"},
+        "task-2": {"task_type": "youtube_transcript", "url": "https://youtu.be/abc", "result": "Summary"},
+        "task-3": {"task_type": "unsupported"},
+    }
+
+    saved = asyncio.run(service.save_workflow_results_async("wf-1", results))
+
+    assert set(saved) == {"task-1", "task-2"}
+    research = (tmp_path / "Research").glob("research_Heat_pumps_*.md")
+    note = next(research).read_text(encoding="utf-8")
+    assert note.startswith("---\ntitle: Heat pumps\n")
+    assert note.endswith("## Results\n\nEfficient")
+    assert saved["task-2"].startswith(str(tmp_path / "Transcripts"))
+
+
+def test_rendered_frontmatter_round_trips_through_yaml(tmp_path):
+    service = ObsidianService(vault_path=str(tmp_path))
+    titles = ["Heat pumps", "yes", "What is: this? #1", "- item", "2026-10-17", 'say "hi"\nbye', "line sep\x85"]
+
+    for title in titles:
+        frontmatter = {"title": title, "tags": ["chat", title], "url": ""}
+        note = service._render_note(frontmatter, "body")
+        _, rendered, _ = note.split("---\n", 2)
+        assert yaml.safe_load(rendered) == frontmatter
+
+
+def test_save_workflow_results_dispatches_on_task_type(tmp_path):
+    service = ObsidianService(vault_path=str(tmp_path))
+    results = {
+        "task-1": {"task_type": "chat_export", "title": "Standup", "content": "Notes"},
+        "task-2": {"task_type": "unsupported"},
+    }
+
+    saved = service.save_workflow_results("wf-1", results)
+
+    assert list(saved) == ["task-1"]
+    assert saved["task-1"].startswith(str(tmp_path / "Chats" / "chat_Standup_"))
+
+
+def test_vault_directory_checks_are_shared_across_instances(tmp_path, monkeypatch):
+    ObsidianService(vault_path=str(tmp_path)).save_chat_capture({"title": "First", "content": "One"})
+
+    def unexpected_check(*args, **kwargs):
+        raise AssertionError("vault directories were checked again")
+
+    # Services are built per request; a fresh instance reuses the directories already checked
+    monkeypatch.setattr(Path, "is_dir", unexpected_check)
+    monkeypatch.setattr(Path, "mkdir", unexpected_check)
+    saved = ObsidianService(vault_path=str(tmp_path)).save_chat_capture({"title": "Second", "content": "Two"})
+
+    assert saved.startswith(str(tmp_path / "Chats" / "chat_Second_"))
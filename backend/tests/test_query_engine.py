@@ -8,6 +8,7 @@ from app.services.query_engine import (
     FilterNode,
     TransformNode,
     AggregateNode,
+    JoinNode,
     ExecutionStatus
 )
 
@@ -154,6 +155,39 @@ class TestQueryExecutionEngine:
         assert 'count' in agg_result
         assert agg_result['count'] == 4  # Mock data has 4 users
 
+    @pytest.mark.asyncio
+    async def test_execute_query_graph_runs_level_concurrently(self, engine, monkeypatch):
+        """Test that independent nodes of one level run at the same time."""
+        in_flight = []
+        peak = []
+
+        async def slow_fetch(node, source_type, config, context):
+            in_flight.append(node.node_id)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(node.node_id)
+            return [{'id': 1, 'age': 30}]
+
+        monkeypatch.setattr(DataSourceNode, '_fetch_real_data', slow_fetch)
+        query_graph = {
+            'nodes': [
+                {'id': '1', 'type': 'dataSource', 'data': {}},
+                {'id': '2', 'type': 'dataSource', 'data': {}},
+                {'id': '3', 'type': 'union', 'data': {}}
+            ],
+            'edges': [{'source': '1', 'target': '3'}, {'source': '2', 'target': '3'}]
+        }
+
+        result = await engine.execute_query_graph(query_graph)
+
+        assert max(peak) == 2
+        assert result['completed_nodes'] == 3
+        assert len(result['results']['3']['result']) == 2
+
+        events = [event async for event in engine.execute_query_graph_streaming(query_graph)]
+        assert [event['type'] for event in events].count('node_complete') == 3
+        assert events[-1]['completed_nodes'] == 3
+
     def test_validate_query_graph_valid(self, engine):
         """Test validating a valid query graph."""
         query_graph = {
@@ -191,6 +225,21 @@ class TestQueryExecutionEngine:
         assert result['valid'] == False
         assert len(result['errors']) > 0
 
+    def test_validate_query_graph_missing_node_id(self, engine):
+        """Test validating a query graph with a node missing its id."""
+        query_graph = {
+            'nodes': [{'id': '1', 'type': 'dataSource'}, {'type': 'filter'}],
+            'edges': [{'source': '1', 'target': '2'}]
+        }
+
+        result = engine.validate_query_graph(query_graph)
+
+        assert result['valid'] == False
+        assert result['errors'] == [
+            "Node 1 missing required 'id' property",
+            "Edge target '2' not found in nodes"
+        ]
+
     def test_validate_query_graph_unknown_node_type(self, engine):
         """Test validating a query graph with unknown node type."""
         query_graph = {
@@ -271,6 +320,38 @@ class TestFilterNode:
         assert len(result) == 2
         assert all(item['name'] == 'Alice' for item in result)
 
+    @pytest.mark.asyncio
+    async def test_execute_repeated_and_unparsed_conditions(self):
+        """Test re-executing a filter and passing data through unparsed conditions."""
+        node = FilterNode('1', {'condition': 'age < 30'})
+
+        input_data = [
+            {'name': 'Alice', 'age': 30},
+            {'name': 'Bob', 'age': 25},
+            {'name': 'Charlie', 'age': '20'}
+        ]
+
+        assert await node.execute(input_data) == [{'name': 'Bob', 'age': 25}]
+        assert await node.execute(input_data) == [{'name': 'Bob', 'age': 25}]
+
+        node = FilterNode('2', {'condition': 'age >= 30'})
+        assert await node.execute(input_data) == input_data
+
+    @pytest.mark.asyncio
+    async def test_execute_compound_filter(self):
+        """Test filtering with and/or joined conditions."""
+        input_data = [
+            {'name': 'Alice', 'age': 30},
+            {'name': 'Bob', 'age': 25},
+            {'name': 'Tom and Jerry', 'age': 35}
+        ]
+
+        node = FilterNode('1', {'condition': "age > 26 AND name = 'Alice' or name = Bob"})
+        assert [item['name'] for item in await node.execute(input_data)] == ['Alice', 'Bob']
+
+        node = FilterNode('2', {'condition': "name = 'Tom and Jerry' and age > 30"})
+        assert [item['name'] for item in await node.execute(input_data)] == ['Tom and Jerry']
+
     @pytest.mark.asyncio
     async def test_execute_no_input_data(self):
         """Test filter node with no input data."""
@@ -367,4 +448,49 @@ class TestAggregateNode:
         result = await node.execute(input_data)
 
         assert isinstance(result, dict)
-        assert result['value'] == 20.0
\ No newline at end of file
+        assert result['value'] == 20.0
+
+class TestJoinNode:
+    """Test JoinNode functionality."""
+
+    users = [
+        {'id': 1, 'name': 'Alice'},
+        {'id': 2, 'name': 'Bob'},
+        {'id': None, 'name': 'Nobody'}
+    ]
+    orders = [
+        {'order': 'a', 'user_id': 1},
+        {'order': 'b', 'user_id': 1},
+        {'order': 'c', 'user_id': 3},
+        {'order': 'd', 'user_id': None}
+    ]
+
+    @pytest.mark.asyncio
+    async def test_execute_inner_join(self):
+        """Test inner join on a key comparison."""
+        node = JoinNode('1', {'join_type': 'inner', 'join_condition': 'left.id == right.user_id'})
+
+        result = await node.execute([self.users, self.orders])
+
+        assert result == [
+            {'id': 1, 'name': 'Alice', 'order': 'a', 'user_id': 1},
+            {'id': 1, 'name': 'Alice', 'order': 'b', 'user_id': 1}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_execute_full_join(self):
+        """Test full join keeps unmatched rows from both sides."""
+        node = JoinNode('1', {'join_type': 'full', 'join_condition': 'id = user_id'})
+
+        result = await node.execute([self.users, self.orders])
+
+        assert [(row.get('name'), row.get('order')) for row in result] == [
+            ('Alice', 'a'), ('Alice', 'b'), ('Bob', None), ('Nobody', None), (None, 'c'), (None, 'd')
+        ]
+
+    @pytest.mark.asyncio
+    async def test_execute_without_key_condition_passes_through(self):
+        """Test a join without a key comparison leaves its input unchanged."""
+        node = JoinNode('1', {'join_type': 'inner', 'join_condition': 'Define join condition'})
+
+        assert await node.execute([self.users, self.orders]) == [self.users, self.orders]
@@ -291,4 +291,101 @@ class TestWorkflowErrorHandling:
             assert "timestamp" in event_data
 
         finally:
-            executor.remove_event_callback(event_callback)
\ No newline at end of file
+            executor.remove_event_callback(event_callback)
+
+    @pytest.mark.asyncio
+    async def test_execute_batch_isolates_failures_per_item(self):
+        """Test that one failing workflow in a batch does not fail the others"""
+        async def fake_execute_workflow(workflow):
+            if workflow == "bad":
+                raise ValueError("bad workflow")
+            return ("run-" + workflow, {})
+
+        with patch.object(self.workflow_service, 'execute_workflow', side_effect=fake_execute_workflow):
+            outcomes = await self.workflow_service.execute_batch(
+                [{"workflow": "a"}, {"workflow": "bad"}, {"workflow": "b"}]
+            )
+
+        assert outcomes[0] == ("run-a", {})
+        assert isinstance(outcomes[1], ValueError)
+        assert outcomes[2] == ("run-b", {})
+
+    @pytest.mark.asyncio
+    async def test_reuse_results_skips_execution_for_identical_content(self):
+        """Test that opted-in runs of identical workflows reuse the first result"""
+        def make_workflow(workflow_id, prompt):
+            return Workflow(
+                id=workflow_id,
+                name="Cached Workflow",
+                nodes=[
+                    Node(id=f"{workflow_id}-a", type="transform", name="A", prompt=prompt),
+                    Node(id=f"{workflow_id}-b", type="export", name="B")
+                ],
+                edges=[Edge(id="e1", source=f"{workflow_id}-a", target=f"{workflow_id}-b")]
+            )
+
+        options = {"reuse_results": True}
+        with patch.object(self.workflow_service.dag_executor, 'execute_workflow', new_callable=AsyncMock) as mock_execute:
+            mock_execute.return_value = {
+                "success": True,
+                "execution_time": 0.1,
+                "execution_order": ["wf-1-a", "wf-1-b"],
+                "node_results": {"wf-1-a": {"output": "HELLO"}, "wf-1-b": {"output": "done"}}
+            }
+
+            _, first = await self.workflow_service.execute_workflow(
+                make_workflow("wf-1", "hello"), options, validate_workflow=False, enable_optimization=False
+            )
+            _, second = await self.workflow_service.execute_workflow(
+                make_workflow("wf-2", "hello"), options, validate_workflow=False, enable_optimization=False
+            )
+            _, changed = await self.workflow_service.execute_workflow(
+                make_workflow("wf-3", "goodbye"), options, validate_workflow=False, enable_optimization=False
+            )
+
+        assert mock_execute.await_count == 2
+        assert first["cache_hit"] is False
+        assert second["cache_hit"] is True
+        assert changed["cache_hit"] is False
+
+        # The reused result reports this run's node ids, not the cached run's
+        assert second["node_results"] == {"wf-2-a": {"output": "HELLO"}, "wf-2-b": {"output": "done"}}
+        assert self.workflow_service.get_run(second["run_id"]).execution_order == ["wf-2-a", "wf-2-b"]
+
+    @pytest.mark.asyncio
+    async def test_reuse_results_misses_when_edge_ports_change(self):
+        """Test that rewiring a parent to a different input port does not reuse the cached result"""
+        def make_workflow(workflow_id, ports):
+            return Workflow(
+                id=workflow_id,
+                name="Ported Workflow",
+                nodes=[
+                    Node(id="a", type="transform", name="A", prompt="first"),
+                    Node(id="b", type="transform", name="B", prompt="second"),
+                    Node(id="c", type="provider", name="C")
+                ],
+                edges=[
+                    Edge(id="e1", source="a", target="c", meta={"target_port": ports[0]}),
+                    Edge(id="e2", source="b", target="c", meta={"target_port": ports[1]})
+                ]
+            )
+
+        options = {"reuse_results": True}
+        with patch.object(self.workflow_service.dag_executor, 'execute_workflow', new_callable=AsyncMock) as mock_execute:
+            mock_execute.return_value = {"success": True, "execution_time": 0.1, "node_results": {}}
+
+            _, first = await self.workflow_service.execute_workflow(
+                make_workflow("wf-1", ("system_prompt", "user_prompt")), options,
+                validate_workflow=False, enable_optimization=False
+            )
+            _, swapped = await self.workflow_service.execute_workflow(
+                make_workflow("wf-2", ("user_prompt", "system_prompt")), options,
+                validate_workflow=False, enable_optimization=False
+            )
+            _, single = await self.workflow_service.execute_workflow(
+                make_workflow("wf-3", ("user_prompt", "user_prompt")), options,
+                validate_workflow=False, enable_optimization=False
+            )
+
+        assert mock_execute.await_count == 3
+        assert [first["cache_hit"], swapped["cache_hit"], single["cache_hit"]] == [False, False, False]
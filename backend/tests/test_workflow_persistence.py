@@ -348,4 +348,53 @@ class TestWorkflowPersistence:
 
         errors = self.persistence_service.validate_workflow(invalid_workflow)
         assert len(errors) > 0
-        assert any("name" in error.lower() for error in errors)
\ No newline at end of file
+        assert any("name" in error.lower() for error in errors)
+
+    def test_storage_stats_track_saves_and_deletes(self):
+        """Test that storage stats stay in sync with saves and deletes"""
+        workflow = Workflow(
+            id="stats-workflow",
+            name="Stats Workflow",
+            metadata=WorkflowMetadata(category="research"),
+            nodes=[Node(id="node1", type="provider", name="Provider", data={})],
+            edges=[]
+        )
+
+        self.persistence_service.save_workflow(workflow)
+        self.persistence_service.save_workflow(workflow)
+
+        stats = self.persistence_service.get_storage_stats()
+        assert stats["totalWorkflows"] == 1
+        assert stats["byCategory"] == {"research": 1}
+
+        # Counters must match a fresh scan of the storage directory
+        rescanned = WorkflowPersistenceService(str(self.temp_dir)).get_storage_stats()
+        assert stats["totalSize"] == rescanned["totalSize"]
+
+        assert self.persistence_service.delete_workflow("stats-workflow")
+        stats = self.persistence_service.get_storage_stats()
+        assert stats["totalWorkflows"] == 0
+        assert stats["byCategory"] == {}
+        assert stats["totalSize"] == WorkflowPersistenceService(str(self.temp_dir)).get_storage_stats()["totalSize"]
+
+    def test_recreated_workflow_gets_a_new_revision(self):
+        """Test that deleting and recreating a workflow under the same ID changes its revision"""
+        workflow = Workflow(
+            id="recreated-workflow",
+            name="Recreated Workflow",
+            nodes=[Node(id="node1", type="provider", name="Provider", data={})],
+            edges=[]
+        )
+
+        self.persistence_service.save_workflow(workflow)
+        first = self.persistence_service.get_workflow_revision("recreated-workflow")
+        assert first[0] == 1
+
+        assert self.persistence_service.delete_workflow("recreated-workflow")
+        assert self.persistence_service.get_workflow_revision("recreated-workflow") is None
+
+        workflow.metadata = None
+        self.persistence_service.save_workflow(workflow)
+        second = self.persistence_service.get_workflow_revision("recreated-workflow")
+        assert second[0] == 1
+        assert second != first